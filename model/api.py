@@ -1,17 +1,47 @@
 # api.py
 import os
-from fastapi import FastAPI, UploadFile, File
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import FastAPI, UploadFile, File, Form, Response, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import httpx
 from dotenv import load_dotenv
-import io
-from PIL import Image
 import base64
 import json
+from utils.cache import DiagnosisCache, image_digest
+from utils.gate import ConcurrencyGate
+from utils.singleflight import SingleFlight
+from utils.httpx import get_http_client, close_http_client
+from utils.diagnosis import (
+    VISION_PROMPT, localise_prompt, strip_code_fence, parse_vision,
+    diagnosis_digest, is_english, render_english,
+)
+from utils.classifier import LocalClassifier
+from utils.jobs import PredictionQueue, QUEUED, RUNNING
+from utils.loop_lag import LoopLagMonitor
+from utils.preprocess import PreparedImage, prepare_image, shutdown_executor, metrics as preprocess_metrics
 
 load_dotenv()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_http_client()
+    prediction_queue.start(run_prediction_job, is_error_result)
+    loop_lag.start()
+    yield
+    await loop_lag.stop()
+    await prediction_queue.stop()
+    await close_http_client()
+    diagnosis_cache.close()
+    vision_cache.close()
+    localisation_cache.close()
+    shutdown_executor()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow CORS
 app.add_middleware(
@@ -28,169 +58,567 @@ if not GEMINI_API_KEY:
 
 
 GEMINI_API_URL = os.getenv("GEMINI_API_URL")
+# Text-only localisation calls can use a cheaper model; defaults to the vision model
+GEMINI_TEXT_API_URL = os.getenv("GEMINI_TEXT_API_URL") or GEMINI_API_URL
+# Optional override for the localisation stream; otherwise derived from GEMINI_TEXT_API_URL
+GEMINI_STREAM_URL = os.getenv("GEMINI_STREAM_URL")
 
+CACHE_TTL = float(os.getenv("DIAGNOSIS_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_PATH = os.getenv("DIAGNOSIS_CACHE_PATH") or None
+CACHE_DISK_ROWS = int(os.getenv("DIAGNOSIS_CACHE_DISK_ROWS", "50000"))
 
-async def detect_disease_with_gemini(image_bytes: bytes, language: str = "English"):
-    """
-    Send image to Gemini API for plant disease detection
-    """
-    try:
-        # Convert image to base64
-        img_base64 = base64.b64encode(image_bytes).decode("utf-8")
-        
-        # Determine MIME type
-        try:
-            image = Image.open(io.BytesIO(image_bytes))
-            image_format = image.format.lower()
-            if image_format == 'jpeg' or image_format == 'jpg':
-                mime_type = "image/jpeg"
-            elif image_format == 'png':
-                mime_type = "image/png"
-            elif image_format == 'webp':
-                mime_type = "image/webp"
-            else:
-                mime_type = "image/jpeg"
-        except:
-            mime_type = "image/jpeg"
-        
-        # Create prompt for disease detection
-        prompt = f"""You are an expert agricultural AI assistant specializing in plant disease diagnosis.
-
-Analyze this image of a plant/crop and provide a detailed disease diagnosis.
-
-Instructions:
-1. Identify the crop/plant type
-2. Detect if there is any disease present
-3. If disease found, identify the specific disease name
-4. Provide detailed information in {language} language
-
-Respond in JSON format with these exact keys:
-{{
-    "result": true/false,
-    "message": "Brief status message",
-    "crop": "Name of the crop/plant",
-    "disease": "Name of the disease (or 'Healthy' if no disease)",
-    "precautions": "Detailed advice including: \\n1) Disease description\\n2) Causes\\n3) Symptoms\\n4) Treatment (chemical and organic)\\n5) Prevention methods\\n6) Early detection tips"
-}}
-
-If the image is not a plant/crop, set result to false and provide appropriate message.
-Provide all advice in {language} language in simple words suitable for farmers."""
-
-        # Prepare request payload with image
-        payload = {
-            "contents": [
-                {
-                    "parts": [
-                        {
-                            "text": prompt
-                        },
-                        {
-                            "inline_data": {
-                                "mime_type": mime_type,
-                                "data": img_base64
-                            }
-                        }
-                    ]
-                }
-            ],
-            "generationConfig": {
-                "temperature": 0.4,
-                "topK": 32,
-                "topP": 1,
-                "maxOutputTokens": 2048,
+
+def cache_path(tier: str) -> Optional[str]:
+    """Each cache tier gets its own sqlite file next to DIAGNOSIS_CACHE_PATH: no shared keys or write locks"""
+    if not CACHE_PATH:
+        return None
+    root, ext = os.path.splitext(CACHE_PATH)
+    return f"{root}.{tier}{ext}"
+
+# CPU-only first tier; disabled unless LOCAL_MODEL_PATH is set
+local_classifier = LocalClassifier(
+    model_path=os.getenv("LOCAL_MODEL_PATH"),
+    advice_path=os.getenv("LOCAL_ADVICE_PATH"),
+    labels_path=os.getenv("LOCAL_LABELS_PATH"),
+    threshold=float(os.getenv("LOCAL_CONFIDENCE_THRESHOLD", "0.85")),
+)
+
+# Final answers keyed by image content hash + language
+diagnosis_cache = DiagnosisCache(int(os.getenv("DIAGNOSIS_CACHE_SIZE", "1024")), CACHE_TTL,
+                                 cache_path("diagnosis"), CACHE_DISK_ROWS)
+# Language-neutral vision results keyed by image content hash
+vision_cache = DiagnosisCache(int(os.getenv("VISION_CACHE_SIZE", "1024")), CACHE_TTL,
+                              cache_path("vision"), CACHE_DISK_ROWS)
+# Rendered text keyed by diagnosis hash + language
+localisation_cache = DiagnosisCache(int(os.getenv("LOCALISATION_CACHE_SIZE", "4096")), CACHE_TTL,
+                                    cache_path("localisation"), CACHE_DISK_ROWS)
+
+
+def is_error_result(result: dict) -> bool:
+    """Error dicts are transient failures and must never be cached"""
+    return result.get("crop") == "Error" or result.get("message") == "No response from Gemini AI"
+
+
+# Bounds concurrent Gemini calls; overflow waits in a short queue, then gets a 503
+gemini_gate = ConcurrencyGate(
+    max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+    max_queue=int(os.getenv("GEMINI_MAX_QUEUE", "32")),
+    queue_timeout=float(os.getenv("GEMINI_QUEUE_TIMEOUT", "10")),
+)
+
+# How late a periodic timer fires on this loop; blocking work in a handler shows up here
+loop_lag = LoopLagMonitor(
+    interval=float(os.getenv("LOOP_LAG_INTERVAL", "0.05")),
+    max_samples=int(os.getenv("LOOP_LAG_SAMPLES", "6000")),
+)
+
+
+def vision_payload_parts(prepared) -> list:
+    return [
+        {
+            "text": VISION_PROMPT
+        },
+        {
+            "inline_data": {
+                "mime_type": prepared.mime_type,
+                "data": base64.b64encode(prepared.data).decode("utf-8")
             }
         }
+    ]
 
-        headers = {
-            "Content-Type": "application/json",
-            "x-goog-api-key": GEMINI_API_KEY
-        }
 
-        # Call Gemini API
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(GEMINI_API_URL, headers=headers, json=payload)
-            response.raise_for_status()
-            result = response.json()
-
-        # Extract response
-        candidates = result.get('candidates', [])
-        if not candidates:
-            return {
-                "result": False,
-                "message": "No response from Gemini AI",
-                "crop": "Unknown",
-                "disease": "Unknown",
-                "precautions": ""
+def build_payload(parts: list, temperature: float = 0.4) -> dict:
+    return {
+        "contents": [
+            {
+                "parts": parts
             }
+        ],
+        "generationConfig": {
+            "temperature": temperature,
+            "topK": 32,
+            "topP": 1,
+            "maxOutputTokens": 2048,
+        }
+    }
 
-        # Get text content
-        content = candidates[0].get('content', {})
-        parts = content.get('parts', [])
-        text_response = "".join([part.get('text', '') for part in parts])
-
-        # Parse JSON response
-        # Remove markdown code blocks if present
-        text_response = text_response.strip()
-        if text_response.startswith("```json"):
-            text_response = text_response[7:]
-        if text_response.startswith("```"):
-            text_response = text_response[3:]
-        if text_response.endswith("```"):
-            text_response = text_response[:-3]
-        text_response = text_response.strip()
-
-        # Parse JSON
-        try:
-            parsed_result = json.loads(text_response)
-            return {
-                "result": parsed_result.get("result", True),
-                "message": parsed_result.get("message", "Analysis complete"),
-                "crop": parsed_result.get("crop", "Unknown"),
-                "disease": parsed_result.get("disease", "Unknown"),
-                "precautions": parsed_result.get("precautions", text_response)
-            }
-        except json.JSONDecodeError:
-            # If JSON parsing fails, return raw response
-            return {
-                "result": True,
-                "message": "Analysis complete (raw format)",
-                "crop": "See precautions",
-                "disease": "See precautions",
-                "precautions": text_response
-            }
 
-    except httpx.HTTPStatusError as e:
+def gemini_headers() -> dict:
+    return {
+        "Content-Type": "application/json",
+        "x-goog-api-key": GEMINI_API_KEY
+    }
+
+
+def candidate_text(result: dict) -> str:
+    """Concatenated text parts of the first candidate ('' when there is none)"""
+    candidates = result.get('candidates', [])
+    if not candidates:
+        return ""
+    content = candidates[0].get('content', {})
+    parts = content.get('parts', [])
+    return "".join([part.get('text', '') for part in parts])
+
+
+def parse_diagnosis(text_response: str) -> dict:
+    """Turn Gemini's (possibly fenced) JSON text into the public result dict"""
+    text_response = strip_code_fence(text_response)
+
+    # Parse JSON
+    try:
+        parsed_result = json.loads(text_response)
         return {
-            "result": False,
-            "message": f"API Error: {e.response.status_code} - {e.response.text}",
-            "crop": "Error",
-            "disease": "Error",
-            "precautions": ""
+            "result": parsed_result.get("result", True),
+            "message": parsed_result.get("message", "Analysis complete"),
+            "crop": parsed_result.get("crop", "Unknown"),
+            "disease": parsed_result.get("disease", "Unknown"),
+            "precautions": parsed_result.get("precautions", text_response)
         }
-    except Exception as e:
+    except json.JSONDecodeError:
+        # If JSON parsing fails, return raw response
         return {
-            "result": False,
-            "message": f"Error: {str(e)}",
-            "crop": "Error",
-            "disease": "Error",
-            "precautions": ""
+            "result": True,
+            "message": "Analysis complete (raw format)",
+            "crop": "See precautions",
+            "disease": "See precautions",
+            "precautions": text_response
         }
 
 
+NO_RESPONSE_RESULT = {
+    "result": False,
+    "message": "No response from Gemini AI",
+    "crop": "Unknown",
+    "disease": "Unknown",
+    "precautions": ""
+}
+
+
+def error_result(message: str) -> dict:
+    return {
+        "result": False,
+        "message": message,
+        "crop": "Error",
+        "disease": "Error",
+        "precautions": ""
+    }
+
+
+async def call_gemini(url: str, payload: dict) -> str:
+    """POST a generateContent payload over the shared keep-alive client and return the text"""
+    async with gemini_gate:
+        client = get_http_client()
+        response = await client.post(url, headers=gemini_headers(), json=payload)
+        response.raise_for_status()
+        result = response.json()
+    return candidate_text(result)
+
+
+async def stream_gemini(url: str, payload: dict):
+    """Yield text chunks from a streamGenerateContent (alt=sse) call"""
+    async with gemini_gate:
+        client = get_http_client()
+        async with client.stream("POST", url, headers=gemini_headers(), json=payload) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                text = candidate_text(json.loads(line[5:]))
+                if text:
+                    yield text
+
+
+# Identical requests arriving together share one diagnosis; its stats are the coalescing metric
+diagnosis_flight = SingleFlight()
+# Vision and localisation passes shared between different requests (e.g. one image, two languages)
+pass_flight = SingleFlight()
+
+
+def vision_key(image_bytes: bytes) -> str:
+    return f"vision:{image_digest(image_bytes)}"
+
+
+async def run_vision_pass(image_bytes: bytes, key: str, on_text=None,
+                          prepared: Optional[PreparedImage] = None) -> dict:
+    """
+    One vision call for an uncached image. With on_text the call is streamed and
+    every text chunk is handed to on_text as it arrives. prepared is reused when
+    the caller already preprocessed the image.
+    """
+    # Decode, orient, downscale and re-encode off the event loop
+    if prepared is None:
+        prepared = await prepare_image(image_bytes)
+    payload = build_payload(vision_payload_parts(prepared))
+    if on_text is None:
+        text_response = await call_gemini(GEMINI_API_URL, payload)
+    else:
+        chunks = []
+        async for text in stream_gemini(stream_twin(GEMINI_API_URL), payload):
+            chunks.append(text)
+            on_text(text)
+        text_response = "".join(chunks)
+    if not text_response:
+        return dict(NO_RESPONSE_RESULT)
+
+    diagnosis = parse_vision(text_response)
+    await vision_cache.set(key, diagnosis)
+    return diagnosis
+
+
+async def analyse_image(image_bytes: bytes, prepared: Optional[PreparedImage] = None) -> dict:
+    """
+    Language-neutral vision pass: crop, disease and structured advice, cached per image
+    """
+    key = vision_key(image_bytes)
+    cached = await vision_cache.get(key)
+    if cached is not None:
+        return cached
+
+    return await pass_flight.do(key, lambda: run_vision_pass(image_bytes, key, prepared=prepared))
+
+
+async def stream_vision(image_bytes: bytes, prepared: Optional[PreparedImage] = None):
+    """
+    Streaming twin of analyse_image: yields ("partial", text) while the vision
+    call generates, then ("diagnosis", dict). Joins an identical call already in
+    flight instead of starting another; that one's chunks are not replayed.
+    """
+    key = vision_key(image_bytes)
+    cached = await vision_cache.get(key)
+    if cached is not None:
+        yield "diagnosis", cached
+        return
+
+    chunks: asyncio.Queue = asyncio.Queue()
+    flight = asyncio.ensure_future(pass_flight.do(key, lambda: run_vision_pass(image_bytes, key, chunks.put_nowait, prepared)))
+    next_chunk = None
+    try:
+        while True:
+            next_chunk = asyncio.ensure_future(chunks.get())
+            done, _ = await asyncio.wait({flight, next_chunk}, return_when=asyncio.FIRST_COMPLETED)
+            if next_chunk not in done:
+                break
+            yield "partial", next_chunk.result()
+        # The call finished first, but the pending get() may already hold a chunk
+        next_chunk.cancel()
+        await asyncio.gather(next_chunk, return_exceptions=True)
+        if not next_chunk.cancelled():
+            yield "partial", next_chunk.result()
+        while not chunks.empty():
+            yield "partial", chunks.get_nowait()
+        yield "diagnosis", flight.result()
+    finally:
+        if next_chunk is not None:
+            next_chunk.cancel()
+        # The shared call itself is shielded inside the single-flight layer
+        flight.cancel()
+
+
+async def localise_diagnosis(diagnosis: dict, language: str) -> dict:
+    """
+    Cheap text-only pass rendering a diagnosis in the requested language, cached per (diagnosis, language)
+    """
+    if is_error_result(diagnosis):
+        return diagnosis
+    if is_english(language):
+        return render_english(diagnosis)
+
+    key = DiagnosisCache.make_key(f"l10n:{diagnosis_digest(diagnosis)}", language)
+    cached = await localisation_cache.get(key)
+    if cached is not None:
+        return cached
+
+    async def fetch():
+        payload = build_payload([{"text": localise_prompt(diagnosis, language)}], temperature=0.2)
+        text_response = await call_gemini(GEMINI_TEXT_API_URL, payload)
+        if not text_response:
+            return dict(NO_RESPONSE_RESULT)
+
+        result = parse_diagnosis(text_response)
+        await localisation_cache.set(key, result)
+        return result
+
+    return await pass_flight.do(key, fetch)
+
+
+async def detect_disease_with_gemini(image_bytes: bytes, language: str = "English",
+                                     prepared: Optional[PreparedImage] = None):
+    """
+    Send image to Gemini API for plant disease detection
+    """
+    try:
+        diagnosis = await analyse_image(image_bytes, prepared)
+        return await localise_diagnosis(diagnosis, language)
+    except HTTPException:
+        # Let the concurrency gate's 503 reach the client
+        raise
+    except httpx.HTTPStatusError as e:
+        return error_result(f"API Error: {e.response.status_code} - {e.response.text}")
+    except Exception as e:
+        return error_result(f"Error: {str(e)}")
+
+
+def stream_twin(url: str) -> str:
+    """streamGenerateContent twin of a generateContent URL, emitting server-sent events"""
+    url = url.replace(":generateContent", ":streamGenerateContent")
+    return url + ("&" if "?" in url else "?") + "alt=sse"
+
+
+def stream_url() -> str:
+    """Streaming URL for the localisation pass"""
+    return GEMINI_STREAM_URL or stream_twin(GEMINI_TEXT_API_URL)
+
+
+async def stream_disease_with_gemini(image_bytes: bytes, language: str = "English",
+                                     prepared: Optional[PreparedImage] = None):
+    """
+    Streaming variant of detect_disease_with_gemini.
+    Both passes are streamed as ("partial", {"pass": "vision" | "localise", "text": ...})
+    chunks, followed by ("result", dict). Cached passes emit no partials.
+    """
+    try:
+        diagnosis = None
+        async for event, data in stream_vision(image_bytes, prepared):
+            if event == "partial":
+                yield "partial", {"pass": "vision", "text": data}
+            else:
+                diagnosis = data
+
+        if is_error_result(diagnosis) or is_english(language):
+            yield "result", await localise_diagnosis(diagnosis, language)
+            return
+
+        key = DiagnosisCache.make_key(f"l10n:{diagnosis_digest(diagnosis)}", language)
+        cached = await localisation_cache.get(key)
+        if cached is not None:
+            yield "result", cached
+            return
+
+        chunks = []
+        payload = build_payload([{"text": localise_prompt(diagnosis, language)}], temperature=0.2)
+        async for text in stream_gemini(stream_url(), payload):
+            chunks.append(text)
+            yield "partial", {"pass": "localise", "text": text}
+
+        text_response = "".join(chunks)
+        if not text_response:
+            yield "result", dict(NO_RESPONSE_RESULT)
+            return
+
+        result = parse_diagnosis(text_response)
+        await localisation_cache.set(key, result)
+        yield "result", result
+
+    except HTTPException:
+        raise
+    except httpx.HTTPStatusError as e:
+        yield "result", error_result(f"API Error: {e.response.status_code} - {e.response.text}")
+    except Exception as e:
+        yield "result", error_result(f"Error: {str(e)}")
+
+
+async def diagnose(image_bytes: bytes, language: str):
+    """
+    Tiered, cached and coalesced diagnosis, returns (result, cache_status, tier).
+    The local classifier answers confident cases; the rest escalate to Gemini.
+    """
+    key = DiagnosisCache.make_key(image_digest(image_bytes), language)
+    cached = await diagnosis_cache.get(key)
+    if cached is not None:
+        return cached, "HIT", "cache"
+
+    # Preprocess once: the classifier looks at the same downscaled image Gemini is sent
+    prepared = await prepare_image(image_bytes) if local_classifier.enabled else None
+    local = await local_classifier.try_answer(prepared, language)
+    if local is not None:
+        return local, "MISS", "local"
+
+    async def fetch():
+        result = await detect_disease_with_gemini(image_bytes, language, prepared)
+        if not is_error_result(result):
+            await diagnosis_cache.set(key, result)
+        return result
+
+    coalesced = diagnosis_flight.in_flight(key)
+    result = await diagnosis_flight.do(key, fetch)
+    return result, "COALESCED" if coalesced else "MISS", "remote"
+
+
+# Submit/collect mode for clients on connections that cannot hold a request open
+prediction_queue = PredictionQueue(
+    workers=int(os.getenv("JOB_WORKERS", "4")),
+    max_pending=int(os.getenv("JOB_MAX_PENDING", "200")),
+    result_ttl=float(os.getenv("JOB_RESULT_TTL", "3600")),
+    # Queued uploads stay in memory until their job finishes
+    max_pending_bytes=int(os.getenv("JOB_MAX_PENDING_MB", "256")) * 2**20,
+)
+
+
+async def run_prediction_job(image_bytes: bytes, language: str) -> dict:
+    result, _, _ = await diagnose(image_bytes, language)
+    return result
+
+
+@app.post("/predict/jobs", status_code=202)
+async def submit_prediction_job(file: UploadFile = File(...), language: str = Form("English")):
+    """
+    Queue a diagnosis and return its job id straight away
+    """
+    image_bytes = await file.read()
+    key = DiagnosisCache.make_key(image_digest(image_bytes), language)
+    job = prediction_queue.submit(key, image_bytes, language)
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.get("/predict/jobs/{job_id}")
+async def get_prediction_job(job_id: str):
+    job = prediction_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_dict()
+
+
+@app.websocket("/predict/jobs/{job_id}/ws")
+async def watch_prediction_job(websocket: WebSocket, job_id: str):
+    """
+    Push the job's status, then its result as soon as it is ready
+    """
+    await websocket.accept()
+    job = prediction_queue.get(job_id)
+    if job is None:
+        await websocket.send_json({"job_id": job_id, "status": "not_found"})
+        await websocket.close(code=4404)
+        return
+
+    try:
+        if job.status in (QUEUED, RUNNING):
+            await websocket.send_json({"job_id": job.id, "status": job.status})
+            await job.finished.wait()
+        await websocket.send_json(job.to_dict())
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "50"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+
+@app.post("/predict/batch/{language}")
+async def predict_batch(language: str, files: List[UploadFile] = File(...)):
+    """
+    Diagnose many images in one request, streaming NDJSON lines as each finishes
+    """
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_FILES} files per batch")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_one(index: int, file: UploadFile):
+        # Each upload is read only once a slot frees up, so at most BATCH_CONCURRENCY are held in memory
+        async with semaphore:
+            try:
+                image_bytes = await file.read()
+                await file.close()
+                result, cache_status, tier = await diagnose(image_bytes, language)
+            except HTTPException as e:
+                result, cache_status, tier = error_result(f"Error: {e.detail}"), "MISS", "remote"
+        return {"index": index, "filename": file.filename, "cache": cache_status, "tier": tier, **result}
+
+    async def stream():
+        # The uploads stay open until the response is sent (FastAPI >= 0.118)
+        tasks = [asyncio.create_task(run_one(index, file)) for index, file in enumerate(files)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                item = await finished
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+        finally:
+            # Client went away: stop spending quota on the rest of the batch
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/predict/{language}/stream")
+async def predict_stream(language: str, file: UploadFile = File(...)):
+    """
+    Opt-in streaming diagnosis over Server-Sent Events.
+    'partial' events carry raw text as Gemini generates it, tagged with the pass
+    (vision, then localise); the final 'result' event carries the same dict as
+    /predict/{language}.
+    """
+    image_bytes = await file.read()
+    key = DiagnosisCache.make_key(image_digest(image_bytes), language)
+
+    async def stream():
+        cached = await diagnosis_cache.get(key)
+        if cached is not None:
+            yield sse_event("result", cached)
+            return
+
+        prepared = await prepare_image(image_bytes) if local_classifier.enabled else None
+        local = await local_classifier.try_answer(prepared, language)
+        if local is not None:
+            yield sse_event("result", local)
+            return
+
+        try:
+            async for event, data in stream_disease_with_gemini(image_bytes, language, prepared):
+                if event == "partial":
+                    yield sse_event("partial", data)
+                else:
+                    if not is_error_result(data):
+                        await diagnosis_cache.set(key, data)
+                    yield sse_event("result", data)
+        except HTTPException as e:
+            yield sse_event("result", error_result(f"Error: {e.detail}"))
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 @app.post("/predict/{language}")
-async def predict(language: str, file: UploadFile = File(...)):
+async def predict(language: str, response: Response, file: UploadFile = File(...)):
     """
     Main endpoint for disease prediction using Gemini AI
     """
     image_bytes = await file.read()
-    result = await detect_disease_with_gemini(image_bytes, language)
+    result, cache_status, tier = await diagnose(image_bytes, language)
+    response.headers["X-Cache"] = cache_status
+    response.headers["X-Inference-Tier"] = tier
     return result
 
 
+@app.get("/metrics")
+async def metrics(lag_since: Optional[float] = None):
+    return {
+        "diagnosis_cache": diagnosis_cache.stats(),
+        "vision_cache": vision_cache.stats(),
+        "localisation_cache": localisation_cache.stats(),
+        "gemini_gate": gemini_gate.stats(),
+        "preprocess": preprocess_metrics.stats(),
+        "single_flight": diagnosis_flight.stats(),
+        "pass_flight": pass_flight.stats(),
+        "prediction_queue": prediction_queue.stats(),
+        "local_classifier": local_classifier.stats(),
+        "event_loop_lag": loop_lag.stats(lag_since),
+    }
+
+
 @app.get("/")
 async def root():
     return {
         "message": "Plant Disease Detection API with Gemini AI",
         "status": "running",
-        "endpoint": "/predict/{language}"
+        "endpoint": "/predict/{language}",
+        "batch_endpoint": "/predict/batch/{language}",
+        "stream_endpoint": "/predict/{language}/stream",
+        "jobs_endpoint": "/predict/jobs"
     }
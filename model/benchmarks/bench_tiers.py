@@ -0,0 +1,139 @@
+"""
+Throughput per core of the local classifier tier vs the remote Gemini tier.
+
+The remote tier runs against an in-process mock of Gemini with a fixed latency,
+so it measures our own CPU cost per request plus what the latency allows at a
+given concurrency. Without --model a random-weight NumPy model is generated,
+which costs the same as a trained one of that shape.
+
+    python benchmarks/bench_tiers.py --images 200 --classes 40 --remote-latency 1.5
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("GEMINI_API_URL", "http://gemini.invalid/models/bench:generateContent")
+os.environ["DIAGNOSIS_CACHE_SIZE"] = "0"
+os.environ["VISION_CACHE_SIZE"] = "0"
+os.environ["LOCALISATION_CACHE_SIZE"] = "0"
+
+import httpx
+import numpy as np
+from PIL import Image
+
+import api
+import utils.httpx as model_httpx
+from utils.classifier import LocalClassifier
+from utils.preprocess import preprocess_image
+
+
+def synthetic_images(count: int, width: int = 1600, height: int = 1200):
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(count):
+        pixels = rng.integers(0, 255, size=(height // 8, width // 8, 3), dtype=np.uint8)
+        image = Image.fromarray(pixels).resize((width, height))
+        out = io.BytesIO()
+        image.save(out, format="JPEG", quality=90)
+        images.append(out.getvalue())
+    return images
+
+
+def random_model(path: str, classes: int, input_size: int):
+    rng = np.random.default_rng(1)
+    np.savez(
+        path,
+        W=rng.normal(size=(input_size * input_size * 3, classes)).astype(np.float32) * 0.01,
+        b=np.zeros(classes, dtype=np.float32),
+        labels=np.array([f"class_{i}" for i in range(classes)]),
+        input_size=np.array(input_size),
+    )
+
+
+def bench_local(classifier: LocalClassifier, images):
+    # Preprocessing is shared with the remote tier, so only classification is timed
+    prepared = [preprocess_image(image_bytes) for image_bytes in images]
+    wall, cpu = time.perf_counter(), time.process_time()
+    for image in prepared:
+        classifier.classify(image)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return {
+        "images": len(images),
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "images_per_core_second": round(len(images) / cpu, 1),
+        "ms_per_image": round(wall / len(images) * 1000, 2),
+    }
+
+
+async def bench_remote(images, latency: float, concurrency: int):
+    text = json.dumps({"result": True, "crop": "Rice", "disease": "Blast", "description": "x" * 2000})
+
+    async def handler(request):
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+    model_httpx.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    api.gemini_gate.__init__(concurrency, len(images), 3600)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(image_bytes):
+        async with semaphore:
+            return await api.detect_disease_with_gemini(image_bytes, "English")
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    await asyncio.gather(*[one(image_bytes) for image_bytes in images])
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    await model_httpx.close_http_client()
+    return {
+        "images": len(images),
+        "latency_seconds": latency,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "images_per_second": round(len(images) / wall, 1),
+        "images_per_core_second": round(len(images) / cpu, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=100)
+    parser.add_argument("--model", help="Existing .npz/.onnx model; random weights when omitted")
+    parser.add_argument("--classes", type=int, default=40)
+    parser.add_argument("--input-size", type=int, default=64)
+    parser.add_argument("--remote-latency", type=float, default=1.5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    images = synthetic_images(args.images)
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = args.model
+        if not model_path:
+            model_path = str(Path(tmp) / "random.npz")
+            random_model(model_path, args.classes, args.input_size)
+        classifier = LocalClassifier(model_path, None, os.getenv("LOCAL_LABELS_PATH"))
+        local = bench_local(classifier, images)
+
+    remote = asyncio.run(bench_remote(images, args.remote_latency, args.concurrency))
+    results = {"local": local, "remote": remote}
+
+    print(f"🖥️  Local : {local['images_per_core_second']} img/core-s, {local['ms_per_image']} ms/img")
+    print(f"☁️  Remote: {remote['images_per_second']} img/s wall at concurrency {args.concurrency}, "
+          f"{remote['images_per_core_second']} img/core-s of our own CPU")
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"📝 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
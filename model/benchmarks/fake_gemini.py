@@ -0,0 +1,97 @@
+"""
+Local stand-in for the Gemini generateContent / streamGenerateContent API.
+
+Latency, error rate and response size are configurable so load tests are
+reproducible without touching the real quota:
+
+    python benchmarks/fake_gemini.py --port 9100 --latency lognormal --median 1.2 --sigma 0.4 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import json
+import random
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class FakeGeminiConfig:
+    latency: str = "lognormal"  # fixed | uniform | lognormal
+    median: float = 1.0         # seconds; the fixed value, or the uniform/lognormal median
+    sigma: float = 0.5          # lognormal shape, or +/- spread for uniform
+    error_rate: float = 0.0
+    response_chars: int = 3000
+    seed: int = 0
+
+
+def create_app(config: FakeGeminiConfig) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(config.seed)
+
+    def delay() -> float:
+        if config.latency == "fixed":
+            return config.median
+        if config.latency == "uniform":
+            return max(0.0, rng.uniform(config.median - config.sigma, config.median + config.sigma))
+        return rng.lognormvariate(0, config.sigma) * config.median
+
+    def answer_text(vision: bool) -> str:
+        filler = "x" * config.response_chars
+        if vision:
+            return json.dumps({"result": True, "message": "Analysis complete", "crop": "Tomato",
+                               "disease": "Early blight", "description": filler})
+        return json.dumps({"result": True, "message": "Analysis complete", "crop": "Tomato",
+                           "disease": "Early blight", "precautions": filler}, ensure_ascii=False)
+
+    def wrap(text: str) -> dict:
+        return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+    @app.post("/models/{model_action:path}")
+    async def generate(model_action: str, request: Request):
+        body = await request.json()
+        vision = any("inline_data" in part for part in body["contents"][0]["parts"])
+        total_delay = delay()
+
+        if rng.random() < config.error_rate:
+            await asyncio.sleep(total_delay)
+            return JSONResponse({"error": {"code": 503, "message": "The model is overloaded."}}, status_code=503)
+
+        text = answer_text(vision)
+        if not model_action.endswith(":streamGenerateContent"):
+            await asyncio.sleep(total_delay)
+            return wrap(text)
+
+        async def stream():
+            chunks = [text[i:i + 200] for i in range(0, len(text), 200)]
+            for chunk in chunks:
+                await asyncio.sleep(total_delay / len(chunks))
+                yield f"data: {json.dumps(wrap(chunk))}\r\n\r\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--median", type=float, default=1.0)
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--response-chars", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args) -> FakeGeminiConfig:
+    return FakeGeminiConfig(args.latency, args.median, args.sigma, args.error_rate, args.response_chars, args.seed)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9100)
+    add_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(config_from_args(args)), host="127.0.0.1", port=args.port, log_level="warning")
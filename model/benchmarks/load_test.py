@@ -0,0 +1,230 @@
+"""
+Load test for /predict/{language} against the local Gemini stand-in.
+
+Starts the stand-in and the model service as separate uvicorn processes, then
+drives the service from this process at fixed concurrency levels with a corpus
+of synthetic photos of several sizes. For every level it reports throughput,
+p50/p95/p99 latency, status codes, the service's own event-loop lag (from
+/metrics) and the service process's peak RSS (sampled with psutil), and writes
+everything to a JSON file tagged with the current commit so runs can be compared.
+
+    pip install psutil  # benchmark-only
+    python benchmarks/load_test.py --concurrency 1,8,32 --requests 200 --median 1.0 --output bench.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+import psutil
+from PIL import Image
+
+from fake_gemini import add_arguments
+
+MODEL_DIR = Path(__file__).parent.parent
+RSS_SAMPLE_SECONDS = 0.05
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, q: float) -> float:
+    return round(float(np.percentile(values, q)) * 1000, 1) if values else 0.0
+
+
+def synthetic_corpus(sizes_mp, per_size: int):
+    """Noisy photo-like JPEGs at each size in megapixels"""
+    rng = np.random.default_rng(42)
+    corpus = []
+    for megapixels in sizes_mp:
+        width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+        height = int(width * 3 / 4)
+        for _ in range(per_size):
+            base = rng.integers(0, 255, size=(height // 16 + 1, width // 16 + 1, 3), dtype=np.uint8)
+            image = Image.fromarray(base).resize((width, height), Image.Resampling.BILINEAR)
+            out = io.BytesIO()
+            image.save(out, format="JPEG", quality=92)
+            corpus.append(out.getvalue())
+    return corpus
+
+
+class ServerProcess:
+    """A uvicorn server in its own process, so its loop and memory are not shared with the load driver"""
+    def __init__(self, command: list, port: int, env: dict):
+        self.port = port
+        self.process = subprocess.Popen([sys.executable, *command], cwd=MODEL_DIR, env=env)
+
+    def start(self, timeout: float = 60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server on port {self.port} exited with {self.process.returncode}")
+            try:
+                httpx.get(f"http://127.0.0.1:{self.port}/", timeout=1)
+                return
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        raise RuntimeError(f"Server on port {self.port} did not start")
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class RssSampler:
+    """Tracks the peak resident memory of another process from a background thread"""
+    def __init__(self, pid: int):
+        self.process = psutil.Process(pid)
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(RSS_SAMPLE_SECONDS):
+            self.peak_mb = max(self.peak_mb, self.process.memory_info().rss / 2**20)
+
+    def start(self):
+        self.peak_mb = self.process.memory_info().rss / 2**20
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.thread.join()
+
+
+async def drive(base_url: str, language: str, corpus, total: int, concurrency: int, unique: bool, offset: int):
+    latencies, statuses = [], {}
+    counter = iter(range(total))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=300,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def worker():
+            for i in counter:
+                image_bytes = corpus[i % len(corpus)]
+                if unique:
+                    # Trailing bytes after the JPEG end marker change the hash, not the picture
+                    image_bytes = image_bytes + f"#{offset + i}".encode()
+                started = time.perf_counter()
+                try:
+                    response = await client.post(f"/predict/{language}", files={"file": ("leaf.jpg", image_bytes, "image/jpeg")})
+                    status = str(response.status_code)
+                    if response.status_code == 200 and response.json().get("crop") == "Error":
+                        status = "200-error"
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    return latencies, statuses, elapsed
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+                                       text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per concurrency level")
+    parser.add_argument("--language", default="hindi")
+    parser.add_argument("--image-sizes", default="0.3,3,12", help="Comma separated image sizes in megapixels")
+    parser.add_argument("--images-per-size", type=int, default=4)
+    parser.add_argument("--repeat", action="store_true", help="Reuse identical images so caches can hit")
+    parser.add_argument("--output", default="bench_results.json")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    gemini_port, service_port = free_port(), free_port()
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    env["GEMINI_API_URL"] = f"http://127.0.0.1:{gemini_port}/models/fake:generateContent"
+    env.pop("GEMINI_TEXT_API_URL", None)
+    env.pop("GEMINI_STREAM_URL", None)
+    gemini_args = ["--latency", args.latency, "--median", str(args.median), "--sigma", str(args.sigma),
+                   "--error-rate", str(args.error_rate), "--response-chars", str(args.response_chars),
+                   "--seed", str(args.seed)]
+
+    print("🖼️  Building image corpus...")
+    corpus = synthetic_corpus([float(s) for s in args.image_sizes.split(",")], args.images_per_size)
+
+    gemini = ServerProcess(["benchmarks/fake_gemini.py", "--port", str(gemini_port), *gemini_args], gemini_port, env)
+    service = ServerProcess(["-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(service_port),
+                             "--log-level", "warning"], service_port, env)
+    service_url = f"http://127.0.0.1:{service_port}"
+
+    levels = []
+    offset = 0
+    service_peak_rss_mb = 0.0
+    try:
+        gemini.start()
+        service.start()
+        rss = RssSampler(service.process.pid)
+        for concurrency in [int(c) for c in args.concurrency.split(",")]:
+            print(f"🚀 Concurrency {concurrency}: {args.requests} requests")
+            level_started = time.time()
+            rss.start()
+            latencies, statuses, elapsed = asyncio.run(drive(
+                service_url, args.language, corpus, args.requests, concurrency, not args.repeat, offset,
+            ))
+            rss.stop()
+            loop_lag = httpx.get(f"{service_url}/metrics", params={"lag_since": level_started}).json()["event_loop_lag"]
+            service_peak_rss_mb = max(service_peak_rss_mb, rss.peak_mb)
+            offset += args.requests
+
+            level = {
+                "concurrency": concurrency,
+                "requests": args.requests,
+                "seconds": round(elapsed, 3),
+                "throughput_rps": round(args.requests / elapsed, 2),
+                "latency_ms": {"p50": percentile(latencies, 50), "p95": percentile(latencies, 95),
+                               "p99": percentile(latencies, 99), "max": percentile(latencies, 100)},
+                "statuses": statuses,
+                "loop_lag_ms": {"p50": loop_lag["p50_ms"], "p99": loop_lag["p99_ms"], "max": loop_lag["max_ms"]},
+                "peak_rss_mb": round(rss.peak_mb, 1),
+            }
+            levels.append(level)
+            print(f"   {level['throughput_rps']} req/s, p50 {level['latency_ms']['p50']} ms, "
+                  f"p99 {level['latency_ms']['p99']} ms, loop lag p99 {level['loop_lag_ms']['p99']} ms, "
+                  f"RSS {level['peak_rss_mb']} MB, {statuses}")
+    finally:
+        service.stop()
+        gemini.stop()
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "corpus": {"images": len(corpus), "mean_bytes": int(np.mean([len(c) for c in corpus]))},
+        "levels": levels,
+        "service_peak_rss_mb": round(service_peak_rss_mb, 1),
+    }
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"📝 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
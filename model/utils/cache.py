@@ -0,0 +1,142 @@
+# AgriCare/model/utils/cache.py
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+def image_digest(image_bytes: bytes) -> str:
+    """Content hash of the raw upload, shared by every cache keyed on an image"""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+class DiskStore:
+    """
+    Small sqlite-backed key/value store so cached diagnoses survive restarts.
+    Every `prune_every` writes, expired rows and then the oldest beyond max_rows are deleted.
+    """
+    def __init__(self, path: str, ttl_seconds: float, max_rows: int, prune_every: int = 100):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.prune_every = prune_every
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS diagnoses (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_diagnoses_created_at ON diagnoses (created_at)")
+        self._conn.commit()
+        self.prune()
+
+    def get(self, key: str) -> Optional[Tuple[dict, float]]:
+        """(value, created_at as Unix time), or None when missing or expired"""
+        row = self._conn.execute("SELECT value, created_at FROM diagnoses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if time.time() - created_at > self.ttl_seconds:
+            self._conn.execute("DELETE FROM diagnoses WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        return json.loads(value), created_at
+
+    def set(self, key: str, value: dict):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO diagnoses (key, value, created_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time()),
+        )
+        self._conn.commit()
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def prune(self):
+        self._conn.execute("DELETE FROM diagnoses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.execute(
+            "DELETE FROM diagnoses WHERE key IN "
+            "(SELECT key FROM diagnoses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+class DiagnosisCache:
+    """Bounded in-process LRU with TTL, optionally backed by a DiskStore of its own"""
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 7 * 24 * 3600, disk_path: Optional[str] = None,
+                 disk_max_rows: int = 50000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        self.disk = DiskStore(disk_path, ttl_seconds, disk_max_rows) if disk_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(digest: str, language: str) -> str:
+        return f"{digest}:{language.strip().lower()}"
+
+    async def get(self, key: str) -> Optional[dict]:
+        if self.max_entries <= 0:
+            self.misses += 1
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self._entries.pop(key, None)
+
+        if self.disk is not None:
+            async with self._lock:
+                stored = await asyncio.to_thread(self.disk.get, key)
+            if stored is not None:
+                value, created_at = stored
+                # Promoted entries keep their original age, so the TTL still counts from the first write
+                self._remember(key, value, self.ttl_seconds - (time.time() - created_at))
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict):
+        if self.max_entries <= 0:
+            return
+        self._remember(key, value)
+        if self.disk is not None:
+            async with self._lock:
+                await asyncio.to_thread(self.disk.set, key, value)
+
+    def _remember(self, key: str, value: dict, ttl_seconds: Optional[float] = None):
+        self._entries[key] = (value, time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
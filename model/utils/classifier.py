@@ -0,0 +1,150 @@
+# AgriCare/model/utils/classifier.py
+
+"""
+Optional CPU-only first-tier classifier.
+
+LOCAL_MODEL_PATH points at either
+  * an .onnx model (needs onnxruntime), labels read from LOCAL_LABELS_PATH (JSON list), or
+  * an .npz file with arrays W (features x classes), b (classes), labels (classes)
+    and input_size (edge of the square RGB input), run as a softmax layer in NumPy.
+
+LOCAL_ADVICE_PATH is a JSON table {label: {language: result_dict}} holding the
+precomputed answer for each class in each language. A prediction is only used
+when it clears LOCAL_CONFIDENCE_THRESHOLD and the table has the language;
+everything else escalates to Gemini.
+"""
+
+import io
+import json
+import os
+from typing import Optional
+import numpy as np
+from PIL import Image, ImageOps
+from utils.preprocess import PreparedImage, run_in_pool
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def to_pixels(prepared: PreparedImage, input_size: int) -> np.ndarray:
+    """
+    (input_size, input_size, 3) float32 array in [0, 1] of the same image Gemini is sent.
+    Uses the image preprocessing already decoded; only decodes when it could not.
+    """
+    image = prepared.image
+    if image is None:
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(prepared.data)))
+    image = image.convert("RGB").resize((input_size, input_size), Image.Resampling.BILINEAR)
+    return np.asarray(image, dtype=np.float32) / 255.0
+
+
+class NumpyModel:
+    def __init__(self, path: str):
+        data = np.load(path, allow_pickle=False)
+        self.W = data["W"].astype(np.float32)
+        self.b = data["b"].astype(np.float32)
+        self.labels = [str(label) for label in data["labels"]]
+        self.input_size = int(data["input_size"])
+
+    def predict(self, pixels: np.ndarray) -> np.ndarray:
+        return softmax(pixels.reshape(1, -1) @ self.W + self.b)[0]
+
+
+class OnnxModel:
+    def __init__(self, path: str, labels_path: str):
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = int(os.getenv("LOCAL_MODEL_THREADS", "1"))
+        self.session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input = self.session.get_inputs()[0]
+        shape = self.input.shape
+        self.input_size = shape[-1] if isinstance(shape[-1], int) else 224
+        with open(labels_path, encoding="utf-8") as f:
+            self.labels = json.load(f)
+
+    def predict(self, pixels: np.ndarray) -> np.ndarray:
+        batch = pixels.transpose(2, 0, 1)[np.newaxis].astype(np.float32)
+        logits = self.session.run(None, {self.input.name: batch})[0][0]
+        return softmax(logits)
+
+
+class LocalClassifier:
+    def __init__(self, model_path: Optional[str], advice_path: Optional[str],
+                 labels_path: Optional[str] = None, threshold: float = 0.85):
+        self.threshold = threshold
+        self.model = None
+        self.advice = {}
+        self.answered = 0
+        self.escalated = 0
+
+        if not model_path:
+            return
+        try:
+            if model_path.endswith(".onnx"):
+                if onnxruntime is None:
+                    raise RuntimeError("onnxruntime is not installed")
+                self.model = OnnxModel(model_path, labels_path)
+            else:
+                self.model = NumpyModel(model_path)
+            if advice_path:
+                with open(advice_path, encoding="utf-8") as f:
+                    self.advice = {
+                        label: {language.lower(): result for language, result in languages.items()}
+                        for label, languages in json.load(f).items()
+                    }
+            print(f"✅ Local classifier loaded: {len(self.model.labels)} classes")
+        except Exception as e:
+            print(f"⚠️ Local classifier disabled: {e}")
+            self.model = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.model is not None
+
+    def classify(self, prepared: PreparedImage):
+        """Returns (label, confidence); blocking, run it on a worker thread"""
+        pixels = to_pixels(prepared, self.model.input_size)
+        probabilities = self.model.predict(pixels)
+        best = int(np.argmax(probabilities))
+        return self.model.labels[best], float(probabilities[best])
+
+    def answer(self, prepared: PreparedImage, language: str) -> Optional[dict]:
+        """Precomputed result when confident and the language is in the table, else None"""
+        try:
+            label, confidence = self.classify(prepared)
+        except Exception as e:
+            print(f"⚠️ Local classification failed: {e}")
+            return None
+
+        result = self.advice.get(label, {}).get(language.strip().lower())
+        if confidence < self.threshold or result is None:
+            return None
+        return dict(result)
+
+    async def try_answer(self, prepared: Optional[PreparedImage], language: str) -> Optional[dict]:
+        if not self.enabled or prepared is None:
+            return None
+
+        result = await run_in_pool(self.answer, prepared, language)
+        if result is None:
+            self.escalated += 1
+        else:
+            self.answered += 1
+        return result
+
+    def stats(self) -> dict:
+        decided = self.answered + self.escalated
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "answered": self.answered,
+            "escalated": self.escalated,
+            "local_ratio": round(self.answered / decided, 4) if decided else 0.0,
+        }
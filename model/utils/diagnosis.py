@@ -0,0 +1,135 @@
+# AgriCare/model/utils/diagnosis.py
+
+import hashlib
+import json
+
+# Fields of the language-neutral diagnosis produced by the vision pass
+DIAGNOSIS_FIELDS = (
+    "description",
+    "causes",
+    "symptoms",
+    "treatment_chemical",
+    "treatment_organic",
+    "prevention",
+    "early_detection",
+)
+
+VISION_PROMPT = """You are an expert agricultural AI assistant specializing in plant disease diagnosis.
+
+Analyze this image of a plant/crop and provide a detailed disease diagnosis.
+
+Instructions:
+1. Identify the crop/plant type
+2. Detect if there is any disease present
+3. If disease found, identify the specific disease name
+4. Provide detailed, practical information for each field below
+
+Respond in JSON format with these exact keys:
+{
+    "result": true/false,
+    "message": "Brief status message",
+    "crop": "Name of the crop/plant",
+    "disease": "Name of the disease (or 'Healthy' if no disease)",
+    "description": "Disease description",
+    "causes": "Causes",
+    "symptoms": "Symptoms",
+    "treatment_chemical": "Chemical treatment",
+    "treatment_organic": "Organic treatment",
+    "prevention": "Prevention methods",
+    "early_detection": "Early detection tips"
+}
+
+If the image is not a plant/crop, set result to false and provide appropriate message.
+Write everything in English in simple words suitable for farmers."""
+
+
+def localise_prompt(diagnosis: dict, language: str) -> str:
+    return f"""You are an expert agricultural AI assistant helping farmers.
+
+Below is a plant disease diagnosis in JSON. Rewrite it for a farmer in {language} language.
+Do not change the diagnosis itself, only translate and present it in simple words.
+
+Diagnosis:
+{json.dumps(diagnosis, ensure_ascii=False)}
+
+Respond in JSON format with these exact keys:
+{{
+    "result": same as the diagnosis,
+    "message": "Brief status message",
+    "crop": "Name of the crop/plant",
+    "disease": "Name of the disease (or 'Healthy' if no disease)",
+    "precautions": "Detailed advice including: \\n1) Disease description\\n2) Causes\\n3) Symptoms\\n4) Treatment (chemical and organic)\\n5) Prevention methods\\n6) Early detection tips"
+}}
+
+Provide all text in {language} language."""
+
+
+def strip_code_fence(text: str) -> str:
+    # Remove markdown code blocks if present
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+def parse_vision(text_response: str) -> dict:
+    """Parse the vision pass into the structured, language-neutral diagnosis"""
+    text_response = strip_code_fence(text_response)
+    try:
+        parsed = json.loads(text_response)
+    except json.JSONDecodeError:
+        # Keep the raw answer so the localisation pass can still present it
+        return {
+            "result": True,
+            "message": "Analysis complete (raw format)",
+            "crop": "See precautions",
+            "disease": "See precautions",
+            "description": text_response,
+        }
+
+    diagnosis = {
+        "result": parsed.get("result", True),
+        "message": parsed.get("message", "Analysis complete"),
+        "crop": parsed.get("crop", "Unknown"),
+        "disease": parsed.get("disease", "Unknown"),
+    }
+    for field in DIAGNOSIS_FIELDS:
+        diagnosis[field] = parsed.get(field, "")
+    return diagnosis
+
+
+def diagnosis_digest(diagnosis: dict) -> str:
+    canonical = json.dumps(diagnosis, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_english(language: str) -> bool:
+    return language.strip().lower() in ("english", "en")
+
+
+def render_english(diagnosis: dict) -> dict:
+    """The vision pass is already English, so rendering it needs no model call"""
+    if not diagnosis.get("result", True):
+        precautions = ""
+    else:
+        sections = [
+            f"1) Disease description: {diagnosis.get('description', '')}",
+            f"2) Causes: {diagnosis.get('causes', '')}",
+            f"3) Symptoms: {diagnosis.get('symptoms', '')}",
+            f"4) Treatment:\nChemical: {diagnosis.get('treatment_chemical', '')}\nOrganic: {diagnosis.get('treatment_organic', '')}",
+            f"5) Prevention methods: {diagnosis.get('prevention', '')}",
+            f"6) Early detection tips: {diagnosis.get('early_detection', '')}",
+        ]
+        precautions = "\n".join(sections)
+
+    return {
+        "result": diagnosis.get("result", True),
+        "message": diagnosis.get("message", "Analysis complete"),
+        "crop": diagnosis.get("crop", "Unknown"),
+        "disease": diagnosis.get("disease", "Unknown"),
+        "precautions": precautions,
+    }
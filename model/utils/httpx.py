@@ -0,0 +1,32 @@
+# AgriCare/model/utils/httpx.py
+
+import os
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+client: httpx.AsyncClient = None
+
+def get_http_client() -> httpx.AsyncClient:
+    global client
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(float(os.getenv("GEMINI_TIMEOUT", "60")), connect=10.0),
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("GEMINI_MAX_CONNECTIONS", "20")),
+                max_keepalive_connections=int(os.getenv("GEMINI_MAX_KEEPALIVE", "10")),
+                keepalive_expiry=float(os.getenv("GEMINI_KEEPALIVE_EXPIRY", "60")),
+            ),
+            http2=HTTP2_AVAILABLE,
+        )
+    return client
+
+async def close_http_client():
+    global client
+    if client is not None:
+        await client.aclose()
+        client = None
@@ -0,0 +1,132 @@
+# AgriCare/model/utils/jobs.py
+
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+from fastapi import HTTPException
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class PredictionJob:
+    def __init__(self, key: str, image_bytes: bytes, language: str):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.image_bytes = image_bytes
+        self.language = language
+        self.status = QUEUED
+        self.result: Optional[dict] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.finished = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "language": self.language,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+        }
+
+
+class PredictionQueue:
+    """
+    Bounded submit/collect queue: a fixed pool of asyncio workers runs the jobs
+    and finished results are kept for result_ttl seconds. Both the number of
+    pending jobs and the upload bytes they hold until they finish are capped.
+    """
+    def __init__(self, workers: int, max_pending: int, result_ttl: float, max_pending_bytes: int):
+        self.worker_count = workers
+        self.result_ttl = result_ttl
+        self.max_pending_bytes = max_pending_bytes
+        self.pending_bytes = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._jobs: Dict[str, PredictionJob] = {}
+        self._by_key: Dict[str, str] = {}
+        self._tasks: List[asyncio.Task] = []
+        self.completed = 0
+        self.failed = 0
+        self.reused = 0
+
+    def start(self, runner: Callable[[bytes, str], Awaitable[dict]], is_failure: Callable[[dict], bool]):
+        self._tasks = [asyncio.create_task(self._worker(runner, is_failure)) for _ in range(self.worker_count)]
+        self._tasks.append(asyncio.create_task(self._janitor()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, key: str, image_bytes: bytes, language: str) -> PredictionJob:
+        # A retried upload of the same image reuses the job instead of queueing new work
+        existing = self._jobs.get(self._by_key.get(key, ""))
+        if existing is not None and existing.status != FAILED:
+            self.reused += 1
+            return existing
+
+        if self.pending_bytes + len(image_bytes) > self.max_pending_bytes:
+            raise HTTPException(status_code=503, detail="Prediction queue is full. Please retry shortly.", headers={"Retry-After": "10"})
+        job = PredictionJob(key, image_bytes, language)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Prediction queue is full. Please retry shortly.", headers={"Retry-After": "10"})
+        self.pending_bytes += len(image_bytes)
+
+        self._jobs[job.id] = job
+        self._by_key[key] = job.id
+        return job
+
+    def get(self, job_id: str) -> Optional[PredictionJob]:
+        return self._jobs.get(job_id)
+
+    async def _worker(self, runner, is_failure):
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            try:
+                job.result = await runner(job.image_bytes, job.language)
+                if is_failure(job.result):
+                    job.status = FAILED
+                    self.failed += 1
+                else:
+                    job.status = DONE
+                    self.completed += 1
+            except Exception as e:
+                job.result = {"result": False, "message": f"Error: {getattr(e, 'detail', e)}",
+                              "crop": "Error", "disease": "Error", "precautions": ""}
+                job.status = FAILED
+                self.failed += 1
+            finally:
+                self.pending_bytes -= len(job.image_bytes)
+                job.image_bytes = b""
+                job.finished_at = time.time()
+                job.finished.set()
+                self._queue.task_done()
+
+    async def _janitor(self):
+        while True:
+            await asyncio.sleep(min(60.0, self.result_ttl))
+            cutoff = time.time() - self.result_ttl
+            expired = [job for job in self._jobs.values() if job.finished_at and job.finished_at < cutoff]
+            for job in expired:
+                self._jobs.pop(job.id, None)
+                if self._by_key.get(job.key) == job.id:
+                    self._by_key.pop(job.key, None)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.worker_count,
+            "pending": self._queue.qsize(),
+            "max_pending": self._queue.maxsize,
+            "pending_bytes": self.pending_bytes,
+            "max_pending_bytes": self.max_pending_bytes,
+            "stored": len(self._jobs),
+            "completed": self.completed,
+            "failed": self.failed,
+            "reused": self.reused,
+        }
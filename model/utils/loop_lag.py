@@ -0,0 +1,50 @@
+# AgriCare/model/utils/loop_lag.py
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+import numpy as np
+
+
+class LoopLagMonitor:
+    """Measures how late a periodic timer fires on the serving event loop; keeps the most recent samples"""
+    def __init__(self, interval: float, max_samples: int):
+        self.interval = interval
+        self._samples: "deque[tuple]" = deque(maxlen=max_samples)  # (wall-clock time, lag seconds)
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self._samples.append((time.time(), lag))
+            self.max_lag = max(self.max_lag, lag)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._probe())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self, since: Optional[float] = None) -> dict:
+        """Percentiles over the kept samples, or only those taken after `since` (Unix seconds)"""
+        lags = [lag for taken_at, lag in self._samples if since is None or taken_at >= since]
+
+        def percentile(q: float) -> float:
+            return round(float(np.percentile(lags, q)) * 1000, 2) if lags else 0.0
+
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": len(lags),
+            "p50_ms": percentile(50),
+            "p99_ms": percentile(99),
+            "max_ms": round(max(lags) * 1000, 2) if lags else 0.0,
+            "max_ever_ms": round(self.max_lag * 1000, 2),
+        }
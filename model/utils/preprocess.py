@@ -0,0 +1,115 @@
+# AgriCare/model/utils/preprocess.py
+
+import asyncio
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from PIL import Image, ImageOps
+
+IMAGE_MAX_EDGE = int(os.getenv("IMAGE_MAX_EDGE", "1024"))
+IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "JPEG").upper()
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "85"))
+
+MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("IMAGE_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    thread_name_prefix="preprocess",
+)
+
+
+class PreparedImage(NamedTuple):
+    data: bytes
+    mime_type: str
+    # The oriented, downscaled image data was encoded from; None when the upload could not be decoded
+    image: Optional[Image.Image] = None
+
+
+class PreprocessMetrics:
+    def __init__(self):
+        self.images = 0
+        self.failures = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, bytes_in: int, bytes_out: int, seconds: float, failed: bool):
+        with self._lock:
+            self.images += 1
+            self.failures += int(failed)
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.seconds += seconds
+
+    def stats(self) -> dict:
+        return {
+            "images": self.images,
+            "failures": self.failures,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "avg_ms": round(self.seconds / self.images * 1000, 2) if self.images else 0.0,
+        }
+
+
+metrics = PreprocessMetrics()
+
+
+def preprocess_image(image_bytes: bytes, max_edge: int = IMAGE_MAX_EDGE,
+                     image_format: str = IMAGE_FORMAT, quality: int = IMAGE_QUALITY) -> PreparedImage:
+    """
+    Decode once, apply EXIF orientation, downscale to max_edge and re-encode.
+    Falls back to the original bytes when the upload cannot be decoded.
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    original_format = image.format
+    original_size = image.size
+
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+    if image_format in ("JPEG", "WEBP") and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    out = io.BytesIO()
+    image.save(out, format=image_format, quality=quality, optimize=True)
+    data = out.getvalue()
+
+    # Already small enough: never send more than the client uploaded
+    if (len(data) >= len(image_bytes) and original_format in MIME_TYPES
+            and image.size == original_size):
+        return PreparedImage(image_bytes, MIME_TYPES[original_format], image)
+    return PreparedImage(data, MIME_TYPES.get(image_format, "image/jpeg"), image)
+
+
+def _timed_preprocess(image_bytes: bytes) -> PreparedImage:
+    started = time.perf_counter()
+    failed = False
+    try:
+        prepared = preprocess_image(image_bytes)
+    except Exception as e:
+        print(f"⚠️ Image preprocessing failed, sending original: {e}")
+        failed = True
+        prepared = PreparedImage(image_bytes, "image/jpeg")
+
+    metrics.record(len(image_bytes), len(prepared.data), time.perf_counter() - started, failed)
+    return prepared
+
+
+async def run_in_pool(fn, *args):
+    """Run blocking image work on the shared worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, fn, *args)
+
+
+async def prepare_image(image_bytes: bytes) -> PreparedImage:
+    """Run preprocessing on the worker pool so the event loop stays free"""
+    return await run_in_pool(_timed_preprocess, image_bytes)
+
+
+def shutdown_executor():
+    _executor.shutdown(wait=False)
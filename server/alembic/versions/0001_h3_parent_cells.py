@@ -0,0 +1,75 @@
+"""store coarser H3 parent cells on jobs and services
+
+Revision ID: 0001_h3_parent_cells
+Revises:
+Create Date: 2026-10-18 00:00:00.000000
+
+Baseline is the schema created by db.init_db(). Adds h3_res7/h3_res6 columns,
+backfills them from h3_index and indexes them, so large-radius nearby lookups
+can probe a compacted, mixed-resolution cover instead of hundreds of res-8 cells.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from h3 import cell_to_parent
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_h3_parent_cells"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("jobs", "services")
+BATCH_SIZE = 5000
+
+
+def backfill(table_name: str) -> None:
+    conn = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer),
+        sa.column("h3_index", sa.String),
+        sa.column("h3_res7", sa.String),
+        sa.column("h3_res6", sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(table.c.id, table.c.h3_index)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            table.update().where(table.c.id == sa.bindparam("row_id")).values(
+                h3_res7=sa.bindparam("res7"), h3_res6=sa.bindparam("res6")
+            ),
+            [
+                {"row_id": row.id, "res7": cell_to_parent(row.h3_index, 7), "res6": cell_to_parent(row.h3_index, 6)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name in TABLES:
+        op.add_column(table_name, sa.Column("h3_res7", sa.String(length=16), nullable=True))
+        op.add_column(table_name, sa.Column("h3_res6", sa.String(length=16), nullable=True))
+        backfill(table_name)
+        op.create_index(f"ix_{table_name}_h3_res7", table_name, ["h3_res7"])
+        op.create_index(f"ix_{table_name}_h3_res6", table_name, ["h3_res6"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in TABLES:
+        op.drop_index(f"ix_{table_name}_h3_res6", table_name=table_name)
+        op.drop_index(f"ix_{table_name}_h3_res7", table_name=table_name)
+        op.drop_column(table_name, "h3_res6")
+        op.drop_column(table_name, "h3_res7")
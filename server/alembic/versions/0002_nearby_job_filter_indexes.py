@@ -0,0 +1,37 @@
+"""indexes backing the nearby-job filters
+
+Revision ID: 0002_nearby_job_filter_indexes
+Revises: 0001_h3_parent_cells
+Create Date: 2026-10-18 00:00:00.000000
+
+Composite (cell, status, start_date) indexes on every resolution the cover
+plan probes (h3_index, h3_res7, h3_res6), so each IN-list of the ring skips
+closed jobs and applies the start-date window inside the index scan, plus a
+GIN index on required_skills for the skills-overlap (&&) filter.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_nearby_job_filter_indexes"
+down_revision: Union[str, Sequence[str], None] = "0001_h3_parent_cells"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_jobs_h3_index_status_start_date", "jobs", ["h3_index", "status", "start_date"])
+    op.create_index("ix_jobs_h3_res7_status_start_date", "jobs", ["h3_res7", "status", "start_date"])
+    op.create_index("ix_jobs_h3_res6_status_start_date", "jobs", ["h3_res6", "status", "start_date"])
+    op.create_index("ix_jobs_required_skills", "jobs", ["required_skills"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_jobs_required_skills", table_name="jobs")
+    op.drop_index("ix_jobs_h3_res6_status_start_date", table_name="jobs")
+    op.drop_index("ix_jobs_h3_res7_status_start_date", table_name="jobs")
+    op.drop_index("ix_jobs_h3_index_status_start_date", table_name="jobs")
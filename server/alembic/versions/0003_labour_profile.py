@@ -0,0 +1,37 @@
+"""labour profile: skills, home location and job preferences
+
+Revision ID: 0003_labour_profile
+Revises: 0002_nearby_job_filter_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+Stores what the matching engine needs to rank jobs for a labourer.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_labour_profile"
+down_revision: Union[str, Sequence[str], None] = "0002_nearby_job_filter_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("labours", sa.Column("skills", sa.ARRAY(sa.String()), nullable=True))
+    op.add_column("labours", sa.Column("latitude", sa.Float(), nullable=True))
+    op.add_column("labours", sa.Column("longitude", sa.Float(), nullable=True))
+    op.add_column("labours", sa.Column("max_distance_km", sa.SmallInteger(), nullable=False, server_default="5"))
+    op.add_column("labours", sa.Column("min_wage", sa.Numeric(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("labours", "min_wage")
+    op.drop_column("labours", "max_distance_km")
+    op.drop_column("labours", "longitude")
+    op.drop_column("labours", "latitude")
+    op.drop_column("labours", "skills")
@@ -0,0 +1,34 @@
+"""(farmer_id, id) indexes for paginated farmer listings
+
+Revision ID: 0004_farmer_listing_indexes
+Revises: 0003_labour_profile
+Create Date: 2026-10-18 00:00:00.000000
+
+GET /api/job and /api/service page through a farmer's listings newest first
+with WHERE farmer_id = ? AND id < ? ORDER BY id DESC; the composite index
+serves that as a single range scan regardless of how many listings exist.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_farmer_listing_indexes"
+down_revision: Union[str, Sequence[str], None] = "0003_labour_profile"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("jobs", "services")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name in TABLES:
+        op.create_index(f"ix_{table_name}_farmer_id_id", table_name, ["farmer_id", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in TABLES:
+        op.drop_index(f"ix_{table_name}_farmer_id_id", table_name=table_name)
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from schemas.user import EmailRequest, EmailOTPRequest, PhoneTokenRequest
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from db import get_db
 from utils.user import get_user_by_email, get_user_by_phone
 from utils.helper import extract_phone
@@ -14,9 +14,9 @@ from models.user import REVERSE_ROLE_MAP
 login_router = APIRouter(prefix="/api", tags=['Auth'])
 
 @login_router.post("/login/email")
-async def login_via_email(request: EmailRequest, db: Session = Depends(get_db)):
+async def login_via_email(request: EmailRequest, db: AsyncSession = Depends(get_db)):
     email = request.email
-    if not get_user_by_email(email, db):
+    if not await get_user_by_email(email, db):
         raise HTTPException(400, "Account does not exist!")
     
     otp = await check_rate_limit(email)
@@ -29,11 +29,11 @@ async def login_via_email(request: EmailRequest, db: Session = Depends(get_db)):
     
 
 @login_router.post("/login/email/verify")
-async def verify_email(request: EmailOTPRequest, db: Session = Depends(get_db)):
+async def verify_email(request: EmailOTPRequest, db: AsyncSession = Depends(get_db)):
     email = request.email
     is_valid = await verify_email_otp(email, request.otp)
     if is_valid:
-        user = get_user_by_email(email, db)
+        user = await get_user_by_email(email, db)
         if user:
             if user.role == 0:
                 user_id = user.farmer.id
@@ -49,7 +49,7 @@ async def verify_email(request: EmailOTPRequest, db: Session = Depends(get_db)):
     
 
 @login_router.post("/login/phone/verify")
-async def verify_phone(request: PhoneTokenRequest, db: Session = Depends(get_db)):
+async def verify_phone(request: PhoneTokenRequest, db: AsyncSession = Depends(get_db)):
     try:
         decoded_token = auth.verify_id_token(request.id_token)
     except Exception as e:
@@ -59,7 +59,7 @@ async def verify_phone(request: PhoneTokenRequest, db: Session = Depends(get_db)
     phone = decoded_token.get("phone_number")
     if phone:
         extracted_phone = extract_phone(phone)
-        user = get_user_by_phone(extracted_phone, db)
+        user = await get_user_by_phone(extracted_phone, db)
         if user:
             if user.role == 0:
                 user_id = user.farmer.id
@@ -1,20 +1,13 @@
 # AgriCare/server/api/chat.py
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends
 from utils.firebase import create_firebase_custom_token
-from utils.token import token_to_user_id, request_to_token
-from sqlalchemy.orm import Session
-from db import get_db
+from utils.token import current_user_id
 
 chat_router = APIRouter(prefix="/api")
 
 @chat_router.post("/firebase-token", tags=["Chat"])
-async def get_firebase_token(request: Request, db: Session = Depends(get_db)):
-    token = request_to_token(request)
-    user_id = token_to_user_id(db, token)
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Could not identify user")
-
+async def get_firebase_token(user_id: int = Depends(current_user_id)):
     token = create_firebase_custom_token(f"user_{user_id}")
 
-    return {"firebase_token": token}
\ No newline at end of file
+    return {"firebase_token": token}
@@ -1,37 +1,74 @@
 # AgriCare/server/api/job.py
 
-from fastapi import APIRouter, Depends, Request
-from schemas.job import JobBase
-from sqlalchemy.orm import Session
-from db import get_db
-from utils.job import create_job, get_jobs, delete_job, nearby_jobs
-from utils.helper import request_to_token
-from utils.token import require_role, token_to_farmer_id
+from fastapi import APIRouter, Depends, Response, Query, WebSocket
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+from datetime import datetime
+from schemas.job import JobBase, JobResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import get_db, get_read_db
+from schemas.bulk import BulkCreateRequest, BulkCreateResponse
+from utils.job import create_job, create_jobs_bulk, get_jobs, delete_job, nearby_jobs, nearby_job_json, JobFilters, naive_utc
+from models.job import STATUS_MAP
+from utils.geogrid import get_k_ring
+from utils.job_feed import job_feed, serve_websocket, sse_stream
+from utils.token import current_farmer_id
 
 job_router = APIRouter(prefix="/api", tags=["Jobs"])
 
 @job_router.post("/job")
-async def create__job(request: Request, job_data: JobBase, db: Session = Depends(get_db), dep=require_role(0)):
-    token = request_to_token(request)
-    farmer_id = token_to_farmer_id(db, token)
+async def create__job(job_data: JobBase, db: AsyncSession = Depends(get_db), farmer_id: int = Depends(current_farmer_id)):
     result = await create_job(farmer_id, job_data, db)
     return result
 
+@job_router.post("/jobs/bulk", response_model=BulkCreateResponse)
+async def create__jobs__bulk(batch: BulkCreateRequest, db: AsyncSession = Depends(get_db), farmer_id: int = Depends(current_farmer_id)):
+    return await create_jobs_bulk(farmer_id, batch.items, db)
+
 @job_router.get("/job")
-async def get__jobs(request: Request, db: Session = Depends(get_db), dep=require_role(0)):
-    token = request_to_token(request)
-    farmer_id = token_to_farmer_id(db, token)
-    jobs = await get_jobs(farmer_id, db)
+async def get__jobs(response: Response, limit: int = Query(50, ge=1, le=200),
+                    cursor: Optional[int] = None, summary: bool = False, db: AsyncSession = Depends(get_read_db), farmer_id: int = Depends(current_farmer_id)):
+    jobs, next_cursor = await get_jobs(farmer_id, db, limit, cursor, summary)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return jobs
 
 @job_router.delete("/job/{job_id}")
-async def delete__job(job_id: int, request: Request, db: Session = Depends(get_db), dep=require_role(0)):
-    token = request_to_token(request)
-    farmer_id = token_to_farmer_id(db, token)
+async def delete__job(job_id: int, db: AsyncSession = Depends(get_db), farmer_id: int = Depends(current_farmer_id)):
     result = await delete_job(job_id, farmer_id, db)
     return result
 
-@job_router.get("/nearby-jobs")
-async def nearby__jobs(latitude: float, longitude: float, k: int = 2, db: Session = Depends(get_db)):
-    jobs = await nearby_jobs(latitude, longitude, k, db)
-    return jobs
\ No newline at end of file
+@job_router.get("/nearby-jobs", response_model=None, responses={200: {"model": List[JobResponse]}})
+async def nearby__jobs(latitude: float, longitude: float, k: int = Query(2, ge=1, le=10),
+                       limit: int = Query(50, ge=1, le=200), cursor: Optional[str] = None,
+                       skills: Optional[List[str]] = Query(None), min_wage: Optional[float] = Query(None, ge=0),
+                       max_wage: Optional[float] = Query(None, ge=0), start_from: Optional[datetime] = None,
+                       start_to: Optional[datetime] = None, status: Literal["open", "closed"] = "open",
+                       db: AsyncSession = Depends(get_read_db)):
+    filters = JobFilters(
+        skills=tuple(sorted(set(skills or ()))),
+        min_wage=min_wage,
+        max_wage=max_wage,
+        start_from=naive_utc(start_from),
+        start_to=naive_utc(start_to),
+        status=STATUS_MAP[status],
+    )
+    page, next_cursor = await nearby_jobs(latitude, longitude, k, db, limit, cursor, filters)
+    response = Response(nearby_job_json.dumps(page), media_type="application/json")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+@job_router.websocket("/nearby-jobs/feed")
+async def nearby__jobs__feed(websocket: WebSocket, latitude: float, longitude: float, k: int = Query(2, ge=1, le=10)):
+    """Push created/removed job events for the H3 cells around the client"""
+    await websocket.accept()
+    subscription = job_feed.subscribe(get_k_ring(latitude, longitude, k))
+    await serve_websocket(websocket, subscription)
+
+@job_router.get("/nearby-jobs/stream")
+async def nearby__jobs__stream(latitude: float, longitude: float, k: int = Query(2, ge=1, le=10)):
+    """Server-sent events variant of the nearby-jobs feed"""
+    subscription = job_feed.subscribe(get_k_ring(latitude, longitude, k))
+    return StreamingResponse(sse_stream(subscription), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,25 @@
+# AgriCare/server/api/labour.py
+
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import get_db
+from schemas.labour import LabourProfile
+from utils.labour import get_profile, update_profile, matched_jobs
+from utils.token import current_labour_id
+
+labour_router = APIRouter(prefix="/api", tags=["Labour"])
+
+@labour_router.get("/labour/profile")
+async def get__profile(db: AsyncSession = Depends(get_db), labour_id: int = Depends(current_labour_id)):
+    return await get_profile(labour_id, db)
+
+@labour_router.put("/labour/profile")
+async def update__profile(profile: LabourProfile, db: AsyncSession = Depends(get_db), labour_id: int = Depends(current_labour_id)):
+    return await update_profile(labour_id, profile, db)
+
+@labour_router.get("/matched-jobs")
+async def matched__jobs(limit: int = Query(20, ge=1, le=100),
+                        latitude: Optional[float] = None, longitude: Optional[float] = None,
+                        db: AsyncSession = Depends(get_db), labour_id: int = Depends(current_labour_id)):
+    return await matched_jobs(labour_id, db, limit, latitude, longitude)
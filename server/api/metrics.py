@@ -0,0 +1,25 @@
+# AgriCare/server/api/metrics.py
+
+from fastapi import APIRouter
+from utils.geogrid import k_ring_cache_stats
+from utils.spatial_index import job_index, service_index
+from utils.nearby_cache import nearby_cache_stats
+from utils.job_feed import job_feed
+from utils.db_metrics import db_metrics
+from utils.identity import identity_cache
+from db import read_pool
+
+metrics_router = APIRouter(prefix="/api", tags=["Metrics"])
+
+@metrics_router.get("/metrics")
+async def get_metrics():
+    return {
+        "k_ring_cache": k_ring_cache_stats(),
+        "job_index": job_index.stats(),
+        "service_index": service_index.stats(),
+        "nearby_cache": nearby_cache_stats.to_dict(),
+        "job_feed": job_feed.stats(),
+        "db": db_metrics.snapshot(),
+        "identity_cache": identity_cache.stats(),
+        "read_replicas": read_pool.stats(),
+    }
@@ -1,39 +1,43 @@
 # AgriCare/server/api/service.py
 
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
-from schemas.service import ServiceBase
-from db import get_db
-from utils.service import create_service, get_services, delete_service, nearby_services
-from utils.helper import request_to_token
-from utils.token import require_role, token_to_farmer_id
+from fastapi import APIRouter, Depends, Response, Query
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.service import ServiceBase, ServiceResponse
+from db import get_db, get_read_db
+from schemas.bulk import BulkCreateRequest, BulkCreateResponse
+from utils.service import create_service, create_services_bulk, get_services, delete_service, nearby_services, nearby_service_json
+from utils.token import current_farmer_id
 
 service_router = APIRouter(prefix="/api", tags=["Services"])
 
 @service_router.post("/service")
-async def create__service(request: Request, service_data: ServiceBase, db: Session = Depends(get_db), dep=require_role(0)):
-    token = request_to_token(request)
-    farmer_id = token_to_farmer_id(db, token)
+async def create__service(service_data: ServiceBase, db: AsyncSession = Depends(get_db), farmer_id: int = Depends(current_farmer_id)):
     result = await create_service(farmer_id, service_data, db)
     return result
 
+@service_router.post("/services/bulk", response_model=BulkCreateResponse)
+async def create__services__bulk(batch: BulkCreateRequest, db: AsyncSession = Depends(get_db), farmer_id: int = Depends(current_farmer_id)):
+    return await create_services_bulk(farmer_id, batch.items, db)
+
 @service_router.get("/service")
-async def get__services(request: Request, db: Session = Depends(get_db), dep=require_role(0)):
-    token = request_to_token(request)
-    farmer_id = token_to_farmer_id(db, token)
-    services = await get_services(farmer_id, db)
+async def get__services(response: Response, limit: int = Query(50, ge=1, le=200),
+                        cursor: Optional[int] = None, summary: bool = False, db: AsyncSession = Depends(get_read_db), farmer_id: int = Depends(current_farmer_id)):
+    services, next_cursor = await get_services(farmer_id, db, limit, cursor, summary)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return services
 
 @service_router.delete("/service/{service_id}")
-async def delete__service(service_id: int, request: Request, db: Session = Depends(get_db), dep=require_role(0)):
-    token = request_to_token(request)
-    farmer_id = token_to_farmer_id(db, token)
+async def delete__service(service_id: int, db: AsyncSession = Depends(get_db), farmer_id: int = Depends(current_farmer_id)):
     result = await delete_service(service_id, farmer_id, db)
     return result
 
-@service_router.get("/nearby-services")
-async def nearby__services(request: Request, latitude: float, longitude: float, k: int = 2, db: Session = Depends(get_db), dep=require_role(0)):
-    token = request_to_token(request)
-    farmer_id = token_to_farmer_id(db, token)
-    services = await nearby_services(farmer_id, latitude, longitude, k, db)
-    return services
+@service_router.get("/nearby-services", response_model=None, responses={200: {"model": List[ServiceResponse]}})
+async def nearby__services(latitude: float, longitude: float, k: int = Query(2, ge=1, le=10),
+                           limit: int = Query(50, ge=1, le=200), cursor: Optional[str] = None, db: AsyncSession = Depends(get_read_db), farmer_id: int = Depends(current_farmer_id)):
+    page, next_cursor = await nearby_services(farmer_id, latitude, longitude, k, db, limit, cursor)
+    response = Response(nearby_service_json.dumps(page), media_type="application/json")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
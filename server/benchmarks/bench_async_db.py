@@ -0,0 +1,158 @@
+"""
+Concurrent nearby queries on one event loop: sync Session vs AsyncSession.
+
+Seeds synthetic open jobs around a few villages (committed under a throwaway
+farmer and deleted afterwards), then fires the nearby-jobs SQL from many
+concurrent coroutines on a single loop, the way one uvicorn worker would serve
+them. The "sync" run calls the blocking Session inline, as the handlers did
+before; the "async" run awaits AsyncSession on the asyncpg engine. Both run the
+identical statement, and report throughput, latency and event-loop lag.
+--slow-ms adds a pg_sleep to every request to mimic a slow query.
+
+    python benchmarks/bench_async_db.py --jobs 20000 --requests 400 --concurrency 1,16,64 --slow-ms 20
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import Session
+from db import engine, AsyncSessionLocal, async_engine
+from models.farmer import Farmer
+from models.job import Job
+from models.user import User
+from utils.geogrid import cover_filter, get_h3_index, get_parent_cells, get_ring
+from utils.job import JobFilters
+
+VILLAGES = [(31.25, 75.70), (30.90, 75.85), (31.63, 74.87), (30.34, 76.38)]
+
+
+def seed(count: int, seed_value: int = 9):
+    rng = random.Random(seed_value)
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(name="Bench Farmer", role=0).returning(User.id)).scalar()
+        farmer_id = conn.execute(insert(Farmer).values(user_id=user_id).returning(Farmer.id)).scalar()
+        rows = []
+        for i in range(count):
+            lat, lng = rng.choice(VILLAGES)
+            lat, lng = lat + rng.uniform(-0.08, 0.08), lng + rng.uniform(-0.08, 0.08)
+            h3_index = get_h3_index(lat, lng)
+            rows.append({
+                "farmer_id": farmer_id, "title": f"Bench {i}", "description": "Seasonal field work.",
+                "number_of_labourers": 5, "required_skills": ["harvesting"], "location": "Bench",
+                "latitude": lat, "longitude": lng, "h3_index": h3_index, **get_parent_cells(h3_index),
+                "daily_wage": 500, "start_date": datetime(2026, 11, 1) + timedelta(days=rng.randint(0, 30)), "status": 1,
+            })
+        for i in range(0, len(rows), 5000):
+            conn.execute(insert(Job), rows[i:i + 5000])
+        conn.exec_driver_sql("ANALYZE jobs")
+    return user_id, farmer_id
+
+
+def cleanup(user_id: int, farmer_id: int):
+    with engine.begin() as conn:
+        conn.execute(delete(Job).where(Job.farmer_id == farmer_id))
+        conn.execute(delete(Farmer).where(Farmer.id == farmer_id))
+        conn.execute(delete(User).where(User.id == user_id))
+
+
+def nearby_statement(latitude: float, longitude: float, radius: int):
+    ring = get_ring(latitude, longitude, radius)
+    return (
+        select(Job, User.name)
+        .join(Farmer, Job.farmer_id == Farmer.id)
+        .join(User, Farmer.user_id == User.id)
+        .where(cover_filter(Job, ring.cover), *JobFilters().clauses(datetime(2026, 10, 1)))
+    )
+
+
+async def sync_request(statement, slow_ms: int) -> int:
+    # What the handlers did before: a blocking Session call inside an async def
+    with Session(engine) as db:
+        if slow_ms:
+            db.execute(text(f"SELECT pg_sleep({slow_ms / 1000})"))
+        return len(db.execute(statement).all())
+
+
+async def async_request(statement, slow_ms: int) -> int:
+    async with AsyncSessionLocal() as db:
+        if slow_ms:
+            await db.execute(text(f"SELECT pg_sleep({slow_ms / 1000})"))
+        return len((await db.execute(statement)).all())
+
+
+async def probe_lag(lags, stop: asyncio.Event, interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def drive(request, statements, concurrency: int, slow_ms: int):
+    latencies, lags = [], []
+    queue = iter(statements)
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe_lag(lags, stop))
+
+    async def worker():
+        for statement in queue:
+            started = time.perf_counter()
+            await request(statement, slow_ms)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await prober
+    return latencies, lags, elapsed
+
+
+def ms(values, q: float) -> float:
+    ordered = sorted(values) or [0.0]
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+
+async def run(args, statements):
+    for concurrency in [int(c) for c in args.concurrency.split(",")]:
+        print(f"🚀 concurrency {concurrency}")
+        for label, request in (("sync", sync_request), ("async", async_request)):
+            await request(statements[0], 0)  # warm the pool
+            latencies, lags, elapsed = await drive(request, statements, concurrency, args.slow_ms)
+            print(f"   {label:<5} {len(statements) / elapsed:8.1f} req/s   p50 {ms(latencies, 0.5):8.1f} ms   "
+                  f"p99 {ms(latencies, 0.99):8.1f} ms   loop lag p99 {ms(lags, 0.99):8.1f} ms   "
+                  f"max {max(lags, default=0) * 1000:8.1f} ms")
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", default="1,16,64")
+    parser.add_argument("--radius", type=int, default=5)
+    parser.add_argument("--slow-ms", type=int, default=0)
+    args = parser.parse_args()
+
+    engine.echo = async_engine.echo = False
+    rng = random.Random(1)
+    points = [(lat + rng.uniform(-0.05, 0.05), lng + rng.uniform(-0.05, 0.05))
+              for lat, lng in (rng.choice(VILLAGES) for _ in range(args.requests))]
+    statements = [nearby_statement(lat, lng, args.radius) for lat, lng in points]
+
+    print(f"📦 seeding {args.jobs} jobs")
+    user_id, farmer_id = seed(args.jobs)
+    try:
+        asyncio.run(run(args, statements))
+    finally:
+        cleanup(user_id, farmer_id)
+
+
+if __name__ == "__main__":
+    main()
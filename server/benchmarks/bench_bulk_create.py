@@ -0,0 +1,128 @@
+"""
+Onboarding a cooperative: N job postings one by one vs one bulk request.
+
+Creates a throwaway farmer and runs create_job N times in a row (one geocoding
+call, INSERT, COMMIT and refresh per posting) and then create_jobs_bulk once
+with the same postings (bounded concurrent geocoding, one executemany INSERT ..
+RETURNING and one COMMIT). Geocoding is replaced by a sleep of --geocode-ms so
+the run needs no Maps key and is repeatable. Reports wall time, the number of
+SQL statements and the time spent in them. All rows are deleted afterwards.
+
+    python benchmarks/bench_bulk_create.py --listings 500 --geocode-ms 80 --concurrency 8
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, insert
+from db import engine, AsyncSessionLocal, async_engine
+from models.farmer import Farmer
+from models.job import Job
+from models.user import User
+from schemas.job import JobBase
+from utils.db_metrics import RequestQueryStats, _request_stats
+import utils.job
+import utils.location
+
+VILLAGES = [(31.25, 75.70), (30.90, 75.85), (31.63, 74.87), (30.34, 76.38)]
+
+
+def make_listings(count: int, seed_value: int = 5) -> list:
+    rng = random.Random(seed_value)
+    listings = []
+    for i in range(count):
+        lat, lng = rng.choice(VILLAGES)
+        listings.append({
+            "title": f"Bench bulk {i}", "description": "Seasonal field work.", "number_of_labourers": rng.randint(1, 20),
+            "required_skills": rng.sample(["harvesting", "sowing", "tractor", "irrigation"], 2),
+            "latitude": round(lat + rng.uniform(-0.08, 0.08), 5), "longitude": round(lng + rng.uniform(-0.08, 0.08), 5),
+            "daily_wage": rng.choice([400, 500, 600, 700]),
+            "start_date": (datetime(2026, 11, 1) + timedelta(days=rng.randint(0, 30))).isoformat(),
+        })
+    return listings
+
+
+def create_farmer():
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(name="Bench Farmer", role=0).returning(User.id)).scalar()
+        farmer_id = conn.execute(insert(Farmer).values(user_id=user_id).returning(Farmer.id)).scalar()
+    return user_id, farmer_id
+
+
+def clear_jobs(farmer_id: int):
+    with engine.begin() as conn:
+        conn.execute(delete(Job).where(Job.farmer_id == farmer_id))
+
+
+def cleanup(user_id: int, farmer_id: int):
+    clear_jobs(farmer_id)
+    with engine.begin() as conn:
+        conn.execute(delete(Farmer).where(Farmer.id == farmer_id))
+        conn.execute(delete(User).where(User.id == user_id))
+
+
+async def timed(label: str, action) -> None:
+    stats = RequestQueryStats()
+    token = _request_stats.set(stats)
+    try:
+        started = time.perf_counter()
+        await action()
+        elapsed = time.perf_counter() - started
+    finally:
+        _request_stats.reset(token)
+    print(f"   {label:<7} {elapsed * 1000:9.1f} ms   {stats.count:5d} statements   {stats.total_ms:8.1f} ms in DB")
+
+
+async def run(args, listings, farmer_id: int):
+    async def fake_geocode(latitude: float, longitude: float) -> str:
+        await asyncio.sleep(args.geocode_ms / 1000)
+        return f"Location: {latitude:.4f}, {longitude:.4f}"
+
+    utils.job.reverse_geocode = utils.location.reverse_geocode = fake_geocode
+    payloads = [JobBase.model_validate(listing) for listing in listings]
+
+    async def serial():
+        async with AsyncSessionLocal() as db:
+            for job_data in payloads:
+                await utils.job.create_job(farmer_id, job_data, db)
+
+    async def bulk():
+        async with AsyncSessionLocal() as db:
+            result = await utils.job.create_jobs_bulk(farmer_id, listings, db)
+            assert result.created == len(listings), result.invalid
+
+    print(f"🚀 {len(listings)} listings, geocoding {args.geocode_ms} ms per call")
+    if not args.skip_serial:
+        await timed("serial", serial)
+        await asyncio.to_thread(clear_jobs, farmer_id)
+    for concurrency in [int(c) for c in args.concurrency.split(",")]:
+        utils.location.reverse_geocode_many.__defaults__ = (concurrency,)
+        await timed(f"bulk/{concurrency}", bulk)
+        await asyncio.to_thread(clear_jobs, farmer_id)
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", type=int, default=500)
+    parser.add_argument("--geocode-ms", type=float, default=80)
+    parser.add_argument("--concurrency", default="8,32")
+    parser.add_argument("--skip-serial", action="store_true")
+    args = parser.parse_args()
+
+    listings = make_listings(args.listings)
+    user_id, farmer_id = create_farmer()
+    try:
+        asyncio.run(run(args, listings, farmer_id))
+    finally:
+        cleanup(user_id, farmer_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Plain res-8 k-ring IN-list vs the compacted multi-resolution cover.
+
+Prints how many cells each radius expands to before and after compaction.
+With --sql, synthetic jobs are inserted into DATABASE_URL inside a rolled-back
+transaction (run `alembic upgrade head` first) and both WHERE clauses are
+timed, with the EXPLAIN ANALYZE plan of the largest radius printed, also with
+the open-status and start-date filters of /api/nearby-jobs applied.
+
+    python benchmarks/bench_h3_cover.py
+    python benchmarks/bench_h3_cover.py --sql --listings 200000
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.geogrid import get_ring, get_k_ring, plan_cover, cover_filter, get_parent_cells
+from bench_nearby_index import synthetic_jobs, query_points
+
+
+def print_cover_sizes():
+    print("radius  k  res8 cells  compacted (per resolution)")
+    for radius in range(1, 11):
+        ring = get_ring(31.25, 75.7, radius)
+        plan = ring.cover
+        sizes = ", ".join(f"r{res}: {len(cells)}" for res, cells in plan)
+        print(f"{radius:>6} {ring.k:>2} {len(ring.cells):>11}  {sum(len(cells) for _, cells in plan):>4} ({sizes})")
+
+
+def bench_sql(listings: int, queries: int):
+    from sqlalchemy import insert, select
+    from db import engine
+    from models.user import User
+    from models.farmer import Farmer
+    from models.job import Job
+    from utils.job import JobFilters
+
+    records = list(synthetic_jobs(listings))
+    points = query_points(queries)
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            user_id = conn.execute(insert(User).values(name="Bench Farmer", role=0).returning(User.id)).scalar()
+            farmer_id = conn.execute(insert(Farmer).values(user_id=user_id).returning(Farmer.id)).scalar()
+            rows = [{k: v for k, v in r._asdict().items() if k not in ("id", "farmer_name")}
+                    | {"farmer_id": farmer_id} | get_parent_cells(r.h3_index)
+                    for r in records]
+            for i in range(0, len(rows), 10000):
+                conn.execute(insert(Job), rows[i:i + 10000])
+            conn.exec_driver_sql("ANALYZE jobs")
+
+            for radius in (2, 5, 10):
+                timings = {"res8 IN-list": 0.0, "compacted": 0.0}
+                for lat, lng in points:
+                    ring = get_k_ring(lat, lng, radius)
+                    for label, clause in (("res8 IN-list", Job.h3_index.in_(ring)),
+                                          ("compacted", cover_filter(Job, plan_cover(ring)))):
+                        started = time.perf_counter()
+                        conn.execute(select(Job.id).where(clause)).all()
+                        timings[label] += time.perf_counter() - started
+                print(f"🔎 radius {radius}: " + ", ".join(
+                    f"{label} {total / len(points) * 1000:.2f} ms" for label, total in timings.items()))
+
+            lat, lng = points[0]
+            ring = get_k_ring(lat, lng, 10)
+            filters = JobFilters(start_from=datetime(2026, 2, 1), start_to=datetime(2026, 2, 15)).clauses(datetime(2026, 1, 1))
+            for label, clauses in (("res8 IN-list", [Job.h3_index.in_(ring)]),
+                                   ("compacted", [cover_filter(Job, plan_cover(ring))]),
+                                   ("compacted + filters", [cover_filter(Job, plan_cover(ring)), *filters])):
+                statement = select(Job.id).where(*clauses).compile(engine, compile_kwargs={"literal_binds": True})
+                plan = conn.exec_driver_sql(f"EXPLAIN ANALYZE {statement}").scalars().all()
+                print(f"\n📋 {label} plan:")
+                print("\n".join(line if len(line) < 160 else line[:157] + "..." for line in plan))
+        finally:
+            transaction.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sql", action="store_true")
+    parser.add_argument("--listings", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print_cover_sizes()
+    if args.sql:
+        bench_sql(args.listings, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Fan-out cost of the nearby-job feed.
+
+Subscribes N in-process clients around one village (each with its own radius,
+so their k-rings overlap but differ), starts one consumer task per client, then
+publishes a single posting in the centre cell and times how long the bus takes
+to enqueue it and how long until every consumer has received it.
+
+    python benchmarks/bench_job_feed.py --subscribers 10000 --rounds 20
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.geogrid import get_h3_index, get_k_ring
+from utils.job_feed import JobFeed
+
+ORIGIN = (31.25, 75.70)
+
+
+async def run(subscribers: int, rounds: int, seed: int = 5):
+    rng = random.Random(seed)
+    feed = JobFeed()
+    cell = get_h3_index(*ORIGIN)
+    posting = {"type": "created", "job": {"id": 1, "title": "Paddy harvest", "daily_wage": 650.0,
+                                           "latitude": ORIGIN[0], "longitude": ORIGIN[1], "h3_index": cell}}
+
+    started = time.perf_counter()
+    subscriptions = []
+    for _ in range(subscribers):
+        # Clients within ~1 km of the post, each watching a 2-10 km radius, so every ring covers its cell
+        lat, lng = ORIGIN[0] + rng.uniform(-0.01, 0.01), ORIGIN[1] + rng.uniform(-0.01, 0.01)
+        subscriptions.append(feed.subscribe(get_k_ring(lat, lng, rng.randint(2, 10))))
+    print(f"📡 {subscribers} subscriptions over {len(feed.bus.by_cell)} cells in {time.perf_counter() - started:.2f}s")
+
+    received = 0
+    all_received = asyncio.Event()
+
+    async def consume(subscription):
+        nonlocal received
+        while True:
+            await subscription.get()
+            received += 1
+            if received == subscribers:
+                all_received.set()
+
+    consumers = [asyncio.create_task(consume(s)) for s in subscriptions]
+    await asyncio.sleep(0)
+
+    enqueue_ms, delivered_ms = [], []
+    for _ in range(rounds):
+        received = 0
+        all_received.clear()
+        started = time.perf_counter()
+        await feed.publish(cell, posting)
+        enqueue_ms.append((time.perf_counter() - started) * 1000)
+        await all_received.wait()
+        delivered_ms.append((time.perf_counter() - started) * 1000)
+
+    for task in consumers:
+        task.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+
+    print(f"   publish + enqueue  p50 {statistics.median(enqueue_ms):7.2f} ms   max {max(enqueue_ms):7.2f} ms")
+    print(f"   all consumers got  p50 {statistics.median(delivered_ms):7.2f} ms   max {max(delivered_ms):7.2f} ms")
+    print(f"   {feed.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.subscribers, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
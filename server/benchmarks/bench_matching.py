@@ -0,0 +1,87 @@
+"""
+Ranking budget for the labour-to-job matching engine.
+
+Builds a candidate set of synthetic open jobs around one labourer (the size a
+dense 10 km ring can return) and times top_matches end to end, plus its two
+stages: laying the records out as arrays and the vectorized scoring pass.
+
+    python benchmarks/bench_matching.py --candidates 10000 --rounds 200
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.geogrid import get_h3_index
+from utils.matching import JobColumns, MatchProfile, score_jobs, top_matches
+from utils.spatial_index import JobRecord
+
+SKILLS = ("harvesting", "sowing", "spraying", "weeding", "irrigation", "tractor", "threshing", "pruning")
+ORIGIN = (31.25, 75.70)
+
+
+def candidate_jobs(count: int, radius_km: float, seed: int = 3):
+    rng = random.Random(seed)
+    now = datetime(2026, 11, 1)
+    # ~111 km per degree of latitude; spread candidates a little past the radius
+    spread = radius_km * 1.2 / 111
+    records = []
+    for i in range(1, count + 1):
+        lat, lng = ORIGIN[0] + rng.uniform(-spread, spread), ORIGIN[1] + rng.uniform(-spread, spread)
+        records.append(JobRecord(
+            id=i, title=f"Job {i}", description="Field work.", number_of_labourers=rng.randint(1, 20),
+            required_skills=tuple(rng.sample(SKILLS, rng.randint(0, 3))) or None,
+            latitude=lat, longitude=lng, daily_wage=float(rng.randint(400, 900)), perks=None,
+            start_date=now + timedelta(days=rng.randint(0, 30)), end_date=None, status=1,
+            location=f"Location: {lat:.4f}, {lng:.4f}", h3_index=get_h3_index(lat, lng),
+            farmer_id=1, farmer_name="Bench Farmer",
+        ))
+    return records, now
+
+
+def timed(fn, rounds: int):
+    durations = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - started) * 1000)
+    durations.sort()
+    return statistics.median(durations), durations[int(len(durations) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--radius", type=float, default=10)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    records, now = candidate_jobs(args.candidates, args.radius)
+    profile = MatchProfile(ORIGIN[0], ORIGIN[1], args.radius, ("harvesting", "tractor"))
+    columns = JobColumns.from_records(records)
+
+    stages = {
+        "columns": lambda: JobColumns.from_records(records),
+        "score": lambda: score_jobs(columns, profile, now),
+        "top_matches": lambda: top_matches(records, profile, now, args.limit),
+    }
+    print(f"🔎 {args.candidates} candidates, top {args.limit}, {args.rounds} rounds")
+    for name, fn in stages.items():
+        fn()  # warm up
+        p50, p95 = timed(fn, args.rounds)
+        print(f"   {name:<12} p50 {p50:6.2f} ms   p95 {p95:6.2f} ms")
+
+    _, p95 = timed(stages["top_matches"], args.rounds)
+    status = "✅ within" if p95 < args.budget_ms else "⚠️ over"
+    print(f"{status} the {args.budget_ms:g} ms budget (top_matches p95 {p95:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+In-memory H3 index vs the SQL path for nearby job lookups.
+
+Builds the index from synthetic listings scattered over Punjab and times
+nearby queries at small and large radii. With --sql the same listings are
+inserted into the configured database inside a transaction that is rolled
+back afterwards, and the SQL path of nearby_jobs is timed on the same points.
+
+    python benchmarks/bench_nearby_index.py --listings 100000,1000000 --queries 2000
+    python benchmarks/bench_nearby_index.py --listings 100000 --sql
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.geogrid import get_h3_index, get_k_ring, get_parent_cells
+from utils.spatial_index import JobRecord, SpatialIndex, job_record_from_row
+
+# Rough bounding box of Punjab
+LAT_RANGE = (29.5, 32.5)
+LNG_RANGE = (73.9, 76.9)
+
+
+def synthetic_jobs(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    for i in range(1, count + 1):
+        lat, lng = rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)
+        yield JobRecord(
+            id=i, title=f"Harvest {i}", description="Paddy harvest, meals provided.",
+            number_of_labourers=rng.randint(1, 20), required_skills=("harvesting",),
+            latitude=lat, longitude=lng, daily_wage=float(rng.randint(400, 900)), perks=None,
+            start_date=start + timedelta(days=rng.randint(0, 90)), end_date=None, status=1,
+            location=f"Location: {lat:.4f}, {lng:.4f}", h3_index=get_h3_index(lat, lng),
+            farmer_id=1, farmer_name="Bench Farmer",
+        )
+
+
+def query_points(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [(rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)) for _ in range(count)]
+
+
+def time_index(index: SpatialIndex, points, radius: int):
+    durations, found = [], 0
+    for lat, lng in points:
+        started = time.perf_counter()
+        found += len(index.query(get_k_ring(lat, lng, radius)))
+        durations.append(time.perf_counter() - started)
+    return durations, found
+
+
+def time_sql(records, points, radius: int):
+    from sqlalchemy import insert
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from db import async_engine
+    from models.user import User
+    from models.farmer import Farmer
+    from models.job import Job
+    from utils.job import nearby_jobs
+    from utils import spatial_index
+
+    spatial_index.job_index.ready = False  # force the SQL path
+
+    async def query_all():
+        async with async_engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                user_id = (await conn.execute(insert(User).values(name="Bench Farmer", role=0).returning(User.id))).scalar()
+                farmer_id = (await conn.execute(insert(Farmer).values(user_id=user_id).returning(Farmer.id))).scalar()
+                rows = [{k: v for k, v in r._asdict().items() if k not in ("id", "farmer_name")}
+                        | {"farmer_id": farmer_id} | get_parent_cells(r.h3_index)
+                        for r in records]
+                for i in range(0, len(rows), 10000):
+                    await conn.execute(insert(Job), rows[i:i + 10000])
+                await conn.exec_driver_sql("ANALYZE jobs")
+
+                db = AsyncSession(bind=conn)
+                durations, found = [], 0
+                for lat, lng in points:
+                    started = time.perf_counter()
+                    found += len((await nearby_jobs(lat, lng, radius, db, limit=10**6))[0])
+                    durations.append(time.perf_counter() - started)
+                await db.close()
+                return durations, found
+            finally:
+                await transaction.rollback()
+
+    async def run():
+        try:
+            return await query_all()
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+def summarize(label: str, durations, found: int):
+    ordered = sorted(durations)
+    p50 = ordered[len(ordered) // 2] * 1e6
+    p99 = ordered[int(len(ordered) * 0.99) - 1] * 1e6
+    print(f"   {label:<6} p50 {p50:10.1f} µs   p99 {p99:10.1f} µs   "
+          f"mean {statistics.mean(durations) * 1e6:10.1f} µs   {found / len(durations):.1f} results/query")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", default="100000,1000000")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--radii", default="2,10")
+    parser.add_argument("--sql", action="store_true", help="Also time the SQL path against DATABASE_URL")
+    args = parser.parse_args()
+
+    for count in [int(c) for c in args.listings.split(",")]:
+        print(f"📦 {count:,} listings")
+        records = list(synthetic_jobs(count))
+        index = SpatialIndex("bench", job_record_from_row)
+        started = time.perf_counter()
+        index.replace_all(records)
+        print(f"   index built in {time.perf_counter() - started:.2f} s over {len(index.cells):,} cells")
+
+        for radius in [int(r) for r in args.radii.split(",")]:
+            print(f"🔎 radius {radius}")
+            points = query_points(args.queries)
+            summarize("index", *time_index(index, points, radius))
+            if args.sql:
+                summarize("sql", *time_sql(records, points[: max(1, args.queries // 20)], radius))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Nearby result sets of 5k rows: ORM hydration + Pydantic vs Core tuples + direct JSON.
+
+Seeds --rows open jobs under a throwaway farmer (deleted afterwards) and runs
+both read paths over exactly those rows:
+
+  orm   select(Job, User.name) -> Job objects -> job_record -> JobResponse per
+        row -> jsonable_encoder + json.dumps (what FastAPI did for the route)
+  core  JOB_RECORD_SELECT -> JobRecord._make per row -> RecordEncoder.dumps
+
+Each path is split into fetch (statement to records) and serialize (ranked
+page to response bytes). CPU time is the median of --repeat runs by
+process_time; allocations are the tracemalloc peak of one extra run. Uses the
+sync engine so driver work stays on this thread and is counted.
+
+    python benchmarks/bench_nearby_serialization.py --rows 5000 --repeat 15
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from db import engine
+from models.farmer import Farmer
+from models.job import Job
+from models.user import User
+from schemas.job import JobResponse
+from utils.distance import rank_by_distance
+from utils.geogrid import get_h3_index, get_parent_cells
+from utils.job import nearby_job_json
+from utils.spatial_index import JOB_RECORD_SELECT, JobRecord, job_record
+
+ORIGIN = (31.25, 75.70)
+
+
+def seed(count: int, seed_value: int = 3):
+    rng = random.Random(seed_value)
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(name="Bench Farmer", role=0).returning(User.id)).scalar()
+        farmer_id = conn.execute(insert(Farmer).values(user_id=user_id).returning(Farmer.id)).scalar()
+        rows = []
+        for i in range(count):
+            lat, lng = ORIGIN[0] + rng.uniform(-0.04, 0.04), ORIGIN[1] + rng.uniform(-0.04, 0.04)
+            h3_index = get_h3_index(lat, lng)
+            rows.append({
+                "farmer_id": farmer_id, "title": f"Bench {i}",
+                "description": "Seasonal field work: harvesting wheat, loading trolleys and stacking straw. " * 3,
+                "number_of_labourers": rng.randint(1, 20), "required_skills": ["harvesting", "tractor"],
+                "perks": ["lunch", "transport"], "location": "Jalandhar, Punjab", "latitude": lat, "longitude": lng,
+                "h3_index": h3_index, **get_parent_cells(h3_index), "daily_wage": rng.choice([450, 500, 550.5]),
+                "start_date": datetime(2026, 11, 1) + timedelta(days=rng.randint(0, 30)), "status": 1,
+            })
+        conn.execute(insert(Job), rows)
+    return user_id, farmer_id
+
+
+def cleanup(user_id: int, farmer_id: int):
+    with engine.begin() as conn:
+        conn.execute(delete(Job).where(Job.farmer_id == farmer_id))
+        conn.execute(delete(Farmer).where(Farmer.id == farmer_id))
+        conn.execute(delete(User).where(User.id == user_id))
+
+
+def orm_fetch(farmer_id: int):
+    with Session(engine) as db:
+        rows = db.execute(
+            select(Job, User.name)
+            .join(Farmer, Job.farmer_id == Farmer.id)
+            .join(User, Farmer.user_id == User.id)
+            .where(Job.farmer_id == farmer_id)
+        )
+        return [job_record(job, name) for job, name in rows]
+
+
+def orm_serialize(page) -> bytes:
+    models = [JobResponse(**record._asdict(), distance_km=round(distance, 3)) for record, distance in page]
+    return JSONResponse(jsonable_encoder(models)).body
+
+
+def core_fetch(farmer_id: int):
+    with engine.connect() as conn:
+        rows = conn.execute(JOB_RECORD_SELECT.where(Job.farmer_id == farmer_id))
+        return list(map(JobRecord._make, rows))
+
+
+def core_serialize(page) -> bytes:
+    return nearby_job_json.dumps(page)
+
+
+def cpu_ms(action, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        action()
+        samples.append((time.process_time() - started) * 1000)
+    return statistics.median(samples)
+
+
+def peak_kib(action) -> float:
+    tracemalloc.start()
+    try:
+        action()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    engine.echo = False
+    print(f"📦 seeding {args.rows} jobs")
+    user_id, farmer_id = seed(args.rows)
+    try:
+        paths = {"orm": (orm_fetch, orm_serialize), "core": (core_fetch, core_serialize)}
+        bodies = {}
+        for label, (fetch, serialize) in paths.items():
+            records = fetch(farmer_id)  # warm the statement cache and connection pool
+            page, _ = rank_by_distance(records, *ORIGIN, radius_km=100, limit=len(records))
+            bodies[label] = serialize(page)
+
+            fetch_cpu = cpu_ms(lambda: fetch(farmer_id), args.repeat)
+            serialize_cpu = cpu_ms(lambda: serialize(page), args.repeat)
+            fetch_peak = peak_kib(lambda: fetch(farmer_id))
+            serialize_peak = peak_kib(lambda: serialize(page))
+            print(f"   {label:<5} {len(records)} rows   fetch {fetch_cpu:7.1f} ms CPU, peak {fetch_peak:8.0f} KiB   "
+                  f"serialize {serialize_cpu:7.1f} ms CPU, peak {serialize_peak:8.0f} KiB   "
+                  f"total {fetch_cpu + serialize_cpu:7.1f} ms")
+        print(f"   identical response bodies: {bodies['orm'] == bodies['core']}")
+    finally:
+        cleanup(user_id, farmer_id)
+
+
+if __name__ == "__main__":
+    main()
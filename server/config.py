@@ -6,6 +6,8 @@ from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Comma-separated read replica URLs; empty sends every read to DATABASE_URL
+    DATABASE_REPLICA_URLS : str = ""
     SMTP_HOST : str
     SMTP_PORT : int
     EMAIL_NAME : str
@@ -16,6 +18,17 @@ class Settings(BaseSettings):
     JWT_ALGORITHM : str
     JWT_EXPIRE_DAYS : int
     GOOGLE_MAPS_API_KEY : str
+    SPATIAL_INDEX_ENABLED : bool = True
+    SPATIAL_INDEX_RECONCILE_SECONDS : int = 300
+    DB_ECHO : bool = False
+    DB_SLOW_QUERY_MS : float = 200
+    DB_QUERY_BUDGET : int = 8
+    AUTH_IDENTITY_CACHE_SIZE : int = 10000
+    AUTH_IDENTITY_CACHE_TTL_SECONDS : int = 300
+    GEOCODE_CONCURRENCY : int = 8
+    DB_REPLICA_CHECK_SECONDS : int = 10
+    DB_REPLICA_MAX_LAG_SECONDS : float = 10
+    READ_YOUR_WRITES_SECONDS : float = 5
 
     # Class Variable
     model_config = SettingsConfigDict(
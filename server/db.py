@@ -1,22 +1,105 @@
 # AgriCare/server/db.py
 
+from contextlib import asynccontextmanager
+from fastapi import Request
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url, URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from config import Config
+from utils.db_metrics import instrument_engine
+from utils.read_replicas import ReplicaPool, RecentWriters
+
+# Clients send this header to read from the primary, e.g. right after their own write
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
 
 
 class Base(DeclarativeBase):
     pass
 
-engine = create_engine(Config.DATABASE_URL, echo=True)
+def async_database_url(database_url: str) -> URL:
+    """The asyncpg flavour of DATABASE_URL, whatever sync driver it names"""
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    query = dict(url.query)
+    # asyncpg takes ssl=<mode> and has no channel_binding option
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    query.pop("channel_binding", None)
+    return url.set(query=query)
+
+# Sync engine for alembic, scripts and the threaded spatial-index loader
+engine = create_engine(Config.DATABASE_URL, echo=Config.DB_ECHO)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+class PrimarySession(Session):
+    """Sync half of request sessions on the primary; commits mark the caller as a recent writer"""
+
+
+# Request handlers use the async engine so queries never block the event loop
+async_engine = create_async_engine(async_database_url(Config.DATABASE_URL), echo=Config.DB_ECHO)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False,
+                                       sync_session_class=PrimarySession)
+
+replica_engines = [
+    create_async_engine(async_database_url(url.strip()), echo=Config.DB_ECHO)
+    for url in Config.DATABASE_REPLICA_URLS.split(",") if url.strip()
+]
+read_pool = ReplicaPool(async_engine, replica_engines, Config.DB_REPLICA_MAX_LAG_SECONDS)
+recent_writers = RecentWriters(Config.READ_YOUR_WRITES_SECONDS)
+ReadSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+for replica_engine in replica_engines:
+    instrument_engine(replica_engine.sync_engine)
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _remember_writer(session):
+    caller = session.info.get("caller")
+    if caller is not None:
+        recent_writers.mark(caller)
+
+
+def request_caller(request: Request) -> str:
+    """Who to keep on the primary after a write: the bearer token, else the client address"""
+    return request.headers.get("Authorization") or (request.client.host if request.client else "")
+
+
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
 
-def get_db() -> Session:
-    db = SessionLocal()
-    try:
+async def get_db(request: Request) -> AsyncSession:
+    async with AsyncSessionLocal(info={"caller": request_caller(request)}) as db:
+        yield db
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """
+    Session for read-only handlers. Goes to a healthy replica unless the client
+    asked for read-your-writes or wrote within the last READ_YOUR_WRITES_SECONDS
+    (tracked per process; across workers clients should send the header).
+    Loads that fill the shared nearby cache still go to the primary, see primary_session.
+    """
+    read_your_writes = (request.headers.get(READ_YOUR_WRITES_HEADER, "").lower() in ("1", "true", "yes")
+                        or recent_writers.recent(request_caller(request)))
+    bind = read_pool.pick(primary=read_your_writes)
+    async with ReadSessionLocal(bind=bind) as db:
+        try:
+            yield db
+        except OSError as e:
+            read_pool.report_failure(bind, e)
+            raise
+
+@asynccontextmanager
+async def primary_session(db: AsyncSession):
+    """
+    db itself unless it reads from a replica, else a short-lived primary session.
+    For reads whose result outlives the request (shared caches): a lagging
+    replica could miss a write whose cache invalidation has already happened.
+    Sessions on the primary's engine or on one of its connections are reused.
+    """
+    if not read_pool.is_replica(db.bind):
         yield db
-    finally:
-        db.close()
+        return
+    async with AsyncSessionLocal() as primary:
+        yield primary
@@ -1,23 +1,56 @@
 # AgriCare/server/main.py
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from db import init_db
+from config import Config
+from db import init_db, async_engine, read_pool
 from api import *
 from api.chat import chat_router
+from utils.httpx import close_http_client
+from utils.spatial_index import reconcile_forever
+from utils.job_feed import job_feed
+from utils.db_metrics import QueryStatsMiddleware
 import utils.firebase
 
-app = FastAPI(title="AgriCare API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    reconciler = None
+    if Config.SPATIAL_INDEX_ENABLED:
+        # Warms the nearby index at startup, then keeps it in step with the DB
+        reconciler = asyncio.create_task(reconcile_forever(Config.SPATIAL_INDEX_RECONCILE_SECONDS))
+    replica_monitor = None
+    if read_pool.replicas:
+        replica_monitor = asyncio.create_task(read_pool.monitor(Config.DB_REPLICA_CHECK_SECONDS))
+    await job_feed.start()
+    yield
+    if reconciler:
+        reconciler.cancel()
+    if replica_monitor:
+        replica_monitor.cancel()
+    await job_feed.stop()
+    await close_http_client()
+    await async_engine.dispose()
+    await read_pool.dispose()
+
+
+app = FastAPI(title="AgriCare API", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
+app.add_middleware(QueryStatsMiddleware)
 
 app.include_router(signup_router)
 app.include_router(login_router)
 app.include_router(job_router)
 app.include_router(service_router)
-app.include_router(chat_router)
\ No newline at end of file
+app.include_router(labour_router)
+app.include_router(chat_router)
+app.include_router(metrics_router)
\ No newline at end of file
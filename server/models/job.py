@@ -1,7 +1,7 @@
 # AgriCare/server/models/job.py
 
 from db import Base
-from sqlalchemy import Column, Integer, ForeignKey, String, Text, Float, Numeric, ARRAY, DateTime, SmallInteger
+from sqlalchemy import Column, Integer, ForeignKey, String, Text, Float, Numeric, ARRAY, DateTime, SmallInteger, Index
 from sqlalchemy.orm import relationship
 
 STATUS_MAP = {"closed": 0, "open": 1}
@@ -19,6 +19,8 @@ class Job(Base):
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     h3_index = Column(String(16), nullable=False, index=True)
+    h3_res7 = Column(String(16), nullable=True, index=True)
+    h3_res6 = Column(String(16), nullable=True, index=True)
     daily_wage = Column(Numeric, nullable=False)
     perks = Column(ARRAY(String), nullable=True)
     start_date = Column(DateTime, nullable=False)
@@ -27,4 +29,12 @@ class Job(Base):
 
     farmer = relationship("Farmer", back_populates="jobs", uselist=False)
 
+    __table_args__ = (
+        Index("ix_jobs_h3_index_status_start_date", "h3_index", "status", "start_date"),
+        Index("ix_jobs_h3_res7_status_start_date", "h3_res7", "status", "start_date"),
+        Index("ix_jobs_h3_res6_status_start_date", "h3_res6", "status", "start_date"),
+        Index("ix_jobs_required_skills", "required_skills", postgresql_using="gin"),
+        Index("ix_jobs_farmer_id_id", "farmer_id", "id"),
+    )
+
 
@@ -1,7 +1,7 @@
 # AgriCare/server/models/labour.py
 
 from db import Base
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, Numeric, ARRAY, SmallInteger
 from sqlalchemy.orm import relationship
 
 class Labour(Base):
@@ -9,5 +9,10 @@ class Labour(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
+    skills = Column(ARRAY(String), nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    max_distance_km = Column(SmallInteger, nullable=False, default=5, server_default="5")
+    min_wage = Column(Numeric, nullable=True)
 
-    user = relationship("User", back_populates="labour")
\ No newline at end of file
+    user = relationship("User", back_populates="labour")
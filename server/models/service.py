@@ -1,7 +1,7 @@
 # AgriCare/server/models/service.py
 
 from db import Base
-from sqlalchemy import Column, Integer, ForeignKey, String, Text, Float, Numeric, SmallInteger
+from sqlalchemy import Column, Integer, ForeignKey, String, Text, Float, Numeric, SmallInteger, Index
 from sqlalchemy.orm import relationship
 
 SERVICE_STATUS = {"inactive": 0, "active": 1}
@@ -17,7 +17,13 @@ class Service(Base):
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     h3_index = Column(String(16), nullable=False, index=True)
+    h3_res7 = Column(String(16), nullable=True, index=True)
+    h3_res6 = Column(String(16), nullable=True, index=True)
     cost = Column(Numeric, nullable=False)
     status = Column(SmallInteger, nullable=False, default=1)
 
     farmer = relationship("Farmer", back_populates="services", uselist=False)
+
+    __table_args__ = (
+        Index("ix_services_farmer_id_id", "farmer_id", "id"),
+    )
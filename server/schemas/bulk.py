@@ -0,0 +1,21 @@
+# AgriCare/server/schemas/bulk.py
+
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+BULK_MAX_ITEMS = 500
+
+class BulkCreateRequest(BaseModel):
+    # Items are validated one by one so a bad entry is reported instead of failing the batch
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: Literal["created", "invalid"]
+    id: Optional[int] = None
+    errors: Optional[List[Dict[str, Any]]] = None
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    invalid: int
+    results: List[BulkItemResult]
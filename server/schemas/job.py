@@ -24,6 +24,20 @@ class JobResponse(JobBase):
     h3_index: str
     farmer_id: int
     farmer_name: str
+    distance_km: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+class JobSummary(BaseModel):
+    id: int
+    title: str
+    number_of_labourers: int
+    daily_wage: float
+    start_date: datetime
+    end_date: Optional[datetime] = None
+    status: int
+    location: str
 
     class Config:
         from_attributes = True
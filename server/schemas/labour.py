@@ -0,0 +1,26 @@
+# AgriCare/server/schemas/labour.py
+
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from schemas.job import JobResponse
+
+
+class LabourProfile(BaseModel):
+    skills: List[str] = []
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    max_distance_km: int = Field(5, ge=1, le=10)
+    min_wage: Optional[float] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def check_location(self) -> 'LabourProfile':
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("Latitude and longitude must be set together!")
+
+        return self
+
+    class Config:
+        from_attributes = True
+
+class MatchedJobResponse(JobResponse):
+    match_score: float
@@ -17,6 +17,17 @@ class ServiceResponse(ServiceBase):
     h3_index: str
     farmer_id: int
     farmer_name: str
+    distance_km: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+class ServiceSummary(BaseModel):
+    id: int
+    service_name: str
+    cost: float
+    status: int
+    location: str
 
     class Config:
         from_attributes = True
@@ -0,0 +1,47 @@
+import math
+import random
+from collections import namedtuple
+from utils.distance import EARTH_RADIUS_KM, rank_by_distance
+from utils.geogrid import get_h3_index, get_ring
+
+Point = namedtuple("Point", "id latitude longitude h3_index")
+
+# Jalandhar plus a spread of places where H3 cells are more distorted
+ORIGINS = [(31.2510782, 75.6997394), (30.90, 75.85), (8.52, 76.94), (59.33, 18.07), (-33.87, 151.21), (64.15, -21.94)]
+
+
+def destination(latitude: float, longitude: float, distance_km: float, bearing: float):
+    lat1, lng1, angular = math.radians(latitude), math.radians(longitude), distance_km / EARTH_RADIUS_KM
+    lat2 = math.asin(math.sin(lat1) * math.cos(angular) + math.cos(lat1) * math.sin(angular) * math.cos(bearing))
+    lng2 = lng1 + math.atan2(math.sin(bearing) * math.sin(angular) * math.cos(lat1),
+                             math.cos(angular) - math.sin(lat1) * math.sin(lat2))
+    return math.degrees(lat2), math.degrees(lng2)
+
+
+def edge_points(latitude: float, longitude: float, radius_km: int, count: int = 360):
+    """Points all around the query circle, just inside its edge"""
+    points = []
+    for i in range(count):
+        lat, lng = destination(latitude, longitude, radius_km * 0.999, 2 * math.pi * i / count)
+        points.append(Point(i, lat, lng, get_h3_index(lat, lng)))
+    return points
+
+
+def test_ring_covers_radius():
+    rng = random.Random(8)
+    for base_lat, base_lng in ORIGINS:
+        # Query points anywhere inside the origin's cell, not just at its centre
+        latitude, longitude = base_lat + rng.uniform(-0.003, 0.003), base_lng + rng.uniform(-0.003, 0.003)
+        for radius in range(1, 11):
+            ring = get_ring(latitude, longitude, radius)
+            points = edge_points(latitude, longitude, radius)
+            # What the cover query would hand back, then the distance cut the nearby routes apply
+            candidates = [point for point in points if point.h3_index in set(ring.cells)]
+            page, _ = rank_by_distance(candidates, latitude, longitude, radius, limit=len(points))
+            missing = len(points) - len(page)
+            assert missing == 0, f"{missing} points within {radius} km of ({latitude}, {longitude}) not returned (k={ring.k})"
+
+
+if __name__ == "__main__":
+    test_ring_covers_radius()
+    print("✅ every point inside the radius is returned")
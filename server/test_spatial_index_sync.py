@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime
+from utils.geogrid import get_h3_index
+from utils.spatial_index import JobRecord, SpatialIndex, job_record_from_row
+
+
+class LoopbackFeed:
+    """Stands in for Redis pub/sub: every broadcast reaches every handler on the channel, the sender's too"""
+    def __init__(self):
+        self.handlers = {}
+
+    def on_broadcast(self, channel, handler):
+        self.handlers.setdefault(channel, []).append(handler)
+
+    async def broadcast(self, channel, message):
+        for handler in self.handlers.get(channel, ()):
+            handler(message)
+
+
+def job(job_id: int, latitude: float = 31.25, longitude: float = 75.70) -> JobRecord:
+    return JobRecord(
+        id=job_id, title=f"Harvest {job_id}", description="Paddy harvest", number_of_labourers=4,
+        required_skills=("harvesting",), latitude=latitude, longitude=longitude, daily_wage=550.0, perks=None,
+        start_date=datetime(2026, 11, 1, 6, 30), end_date=None, status=1, location="Jalandhar, Punjab",
+        h3_index=get_h3_index(latitude, longitude), farmer_id=1, farmer_name="Farmer One",
+    )
+
+
+def test_changes_reach_the_other_process():
+    feed = LoopbackFeed()
+    # One index per worker process, both listening on the same channel
+    here, there = SpatialIndex("jobs", job_record_from_row, feed), SpatialIndex("jobs", job_record_from_row, feed)
+    created = [job(1), job(2), job(3, 31.30, 75.75)]
+
+    asyncio.run(here.upsert_all(created))
+    cells = {record.h3_index for record in created}
+    assert sorted(record.id for record in there.query(cells)) == [1, 2, 3]
+    assert there.query([created[0].h3_index])[0].start_date == created[0].start_date
+    assert here.received == 0 and there.received == 1
+
+    asyncio.run(there.remove_all([2]))
+    assert sorted(record.id for record in here.query(cells)) == [1, 3]
+    assert sorted(record.id for record in there.query(cells)) == [1, 3]
+
+
+def test_changes_during_a_rebuild_survive_the_swap():
+    feed = LoopbackFeed()
+    here, there = SpatialIndex("jobs", job_record_from_row, feed), SpatialIndex("jobs", job_record_from_row, feed)
+    there.begin_rebuild()
+    asyncio.run(here.upsert_all([job(7)]))
+    # The snapshot was read before job 7 was committed
+    there.replace_all([job(1)])
+    assert sorted(record.id for record in there.query([job(1).h3_index])) == [1, 7]
+
+
+if __name__ == "__main__":
+    test_changes_reach_the_other_process()
+    test_changes_during_a_rebuild_survive_the_swap()
+    print("✅ index changes reach every process")
@@ -0,0 +1,28 @@
+# AgriCare/server/utils/bulk.py
+
+from typing import Any, Dict, List, Sequence, Tuple, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+from schemas.bulk import BulkItemResult, BulkCreateResponse
+
+Item = TypeVar("Item", bound=BaseModel)
+
+
+def validate_items(items: Sequence[Dict[str, Any]], schema: Type[Item]) -> Tuple[List[Tuple[int, Item]], List[BulkItemResult]]:
+    """Validate every item up front; returns (index, model) pairs for the good ones and results for the rest"""
+    valid, rejected = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False, include_input=False)
+            rejected.append(BulkItemResult(index=index, status="invalid", errors=errors))
+    return valid, rejected
+
+
+def bulk_response(valid: Sequence[Tuple[int, BaseModel]], ids: Sequence[int], rejected: List[BulkItemResult]) -> BulkCreateResponse:
+    created = [BulkItemResult(index=index, status="created", id=id) for (index, _), id in zip(valid, ids)]
+    return BulkCreateResponse(
+        created=len(created),
+        invalid=len(rejected),
+        results=sorted(created + rejected, key=lambda result: result.index),
+    )
@@ -0,0 +1,184 @@
+# AgriCare/server/utils/db_metrics.py
+
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import date, datetime
+from typing import Dict, Optional
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from config import Config
+
+RECENT_SLOW_QUERIES = 20
+STATEMENT_PREVIEW_CHARS = 300
+
+
+class RequestQueryStats:
+    """Queries issued while serving one request"""
+    __slots__ = ("count", "total_ms", "slowest_ms", "slowest_statement")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.1f};desc="{self.count} queries"'
+
+
+_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestQueryStats]:
+    return _request_stats.get()
+
+
+def _type_name(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    if isinstance(value, datetime):
+        return "datetime"
+    if isinstance(value, date):
+        return "date"
+    return type(value).__name__
+
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    """Types and counts of bound parameters, never their values"""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} rows of ({parameter_shape(parameters[0])})"
+    if isinstance(parameters, dict):
+        values = parameters.values()
+    elif isinstance(parameters, (list, tuple)):
+        values = parameters
+    else:
+        return _type_name(parameters)
+    counts = Counter(map(_type_name, values))
+    return ", ".join(f"{count}×{name}" if count > 1 else name for name, count in counts.items()) or "none"
+
+
+class RouteStats:
+    __slots__ = ("requests", "queries", "db_ms", "max_queries", "over_budget")
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.db_ms = 0.0
+        self.max_queries = 0
+        self.over_budget = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "avg_queries": round(self.queries / self.requests, 2) if self.requests else 0.0,
+            "max_queries": self.max_queries,
+            "db_ms": round(self.db_ms, 1),
+            "avg_db_ms": round(self.db_ms / self.requests, 2) if self.requests else 0.0,
+            "over_budget": self.over_budget,
+        }
+
+
+class DBMetrics:
+    """Process-wide aggregates fed by engine events and the request middleware"""
+    def __init__(self, slow_query_ms: float, query_budget: int):
+        self.slow_query_ms = slow_query_ms
+        self.query_budget = query_budget
+        self.queries = 0
+        self.db_ms = 0.0
+        self.slow_queries = 0
+        self.recent_slow: deque = deque(maxlen=RECENT_SLOW_QUERIES)
+        self.routes: Dict[str, RouteStats] = {}
+
+    def record_query(self, statement: str, parameters, executemany: bool, elapsed_ms: float):
+        self.queries += 1
+        self.db_ms += elapsed_ms
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+
+        if elapsed_ms >= self.slow_query_ms:
+            self.slow_queries += 1
+            shape = parameter_shape(parameters, executemany)
+            preview = " ".join(statement.split())[:STATEMENT_PREVIEW_CHARS]
+            self.recent_slow.append({"ms": round(elapsed_ms, 1), "statement": preview, "params": shape, "at": time.time()})
+            print(f"⚠️ Slow query ({elapsed_ms:.1f} ms): {preview} | params: {shape}")
+
+    def finish_request(self, route: str, stats: RequestQueryStats):
+        if stats.count == 0:
+            return
+        route_stats = self.routes.setdefault(route, RouteStats())
+        route_stats.requests += 1
+        route_stats.queries += stats.count
+        route_stats.db_ms += stats.total_ms
+        route_stats.max_queries = max(route_stats.max_queries, stats.count)
+        if stats.count > self.query_budget:
+            route_stats.over_budget += 1
+            print(f"⚠️ {route} ran {stats.count} queries (budget {self.query_budget}), "
+                  f"{stats.total_ms:.1f} ms in DB; slowest {stats.slowest_ms:.1f} ms")
+
+    def snapshot(self) -> dict:
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.db_ms, 1),
+            "slow_query_ms": self.slow_query_ms,
+            "slow_queries": self.slow_queries,
+            "query_budget": self.query_budget,
+            "routes": {route: stats.to_dict() for route, stats in sorted(self.routes.items())},
+            "recent_slow": list(self.recent_slow),
+        }
+
+
+db_metrics = DBMetrics(Config.DB_SLOW_QUERY_MS, Config.DB_QUERY_BUDGET)
+
+
+def instrument_engine(engine):
+    """Time every statement on a sync engine (pass async_engine.sync_engine for async ones)"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - context._query_started) * 1000
+        db_metrics.record_query(statement, parameters, executemany, elapsed_ms)
+
+
+class QueryStatsMiddleware:
+    """
+    Gives each HTTP request its own query counter, reports it in a Server-Timing
+    header and folds it into the per-route aggregates when the request ends.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and stats.count:
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            route = scope.get("route")
+            db_metrics.finish_request(f"{scope['method']} {getattr(route, 'path', scope['path'])}", stats)
@@ -0,0 +1,63 @@
+# AgriCare/server/utils/distance.py
+
+import base64
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from fastapi import HTTPException
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to many, in a single vectorized pass"""
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlng = np.radians(longitudes) - np.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def encode_cursor(distance_km: float, record_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{distance_km!r}:{record_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        distance_km, record_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(distance_km), int(record_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def rank_by_distance(records: Sequence, latitude: float, longitude: float, radius_km: float,
+                     limit: int, cursor: Optional[str] = None) -> Tuple[List[Tuple[object, float]], Optional[str]]:
+    """
+    Keep records within radius_km, order by (distance, id) and return one page
+    of (record, distance_km) pairs plus the cursor for the next page.
+    Records only need .id, .latitude and .longitude.
+    """
+    if not records:
+        return [], None
+
+    count = len(records)
+    latitudes = np.fromiter((r.latitude for r in records), dtype=np.float64, count=count)
+    longitudes = np.fromiter((r.longitude for r in records), dtype=np.float64, count=count)
+    ids = np.fromiter((r.id for r in records), dtype=np.int64, count=count)
+    distances = haversine_km(latitude, longitude, latitudes, longitudes)
+
+    mask = distances <= radius_km
+    if cursor:
+        after_distance, after_id = decode_cursor(cursor)
+        mask &= (distances > after_distance) | ((distances == after_distance) & (ids > after_id))
+
+    candidates = np.flatnonzero(mask)
+    order = candidates[np.lexsort((ids[candidates], distances[candidates]))]
+    page = order[:limit]
+
+    next_cursor = None
+    if len(order) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(float(distances[last]), int(ids[last]))
+
+    return [(records[i], float(distances[i])) for i in page], next_cursor
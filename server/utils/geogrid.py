@@ -1,14 +1,99 @@
 # AgriCare/server/utils/geogrid.py
 
-from h3 import latlng_to_cell, grid_disk
+import math
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Tuple
+from h3 import (latlng_to_cell, grid_disk, cell_to_parent, compact_cells, cell_to_children, get_resolution,
+                cell_to_latlng, cell_to_boundary, great_circle_distance)
+from sqlalchemy import or_
 
 H3_RESOLUTION = 8
-RADIUS_K_MAP = {1:1, 2:2, 3:4, 4:5, 5:6, 6:7, 7:8, 8:10, 9:11, 10:12}
+# Distance a disk is guaranteed to grow per ring, in circumradii of its origin cell. A regular
+# grid gives 1.5; H3 cells are distorted enough that 1.29 was the worst measured worldwide.
+RING_STEP_CIRCUMRADII = 1.25
+
+# Coarser parents stored next to h3_index so large covers compact into few cells
+H3_PARENT_RESOLUTIONS = (6, 7)
+H3_COLUMNS = {6: "h3_res6", 7: "h3_res7", H3_RESOLUTION: "h3_index"}
+
+K_RING_CACHE_SIZE = 8192
+
+# ((resolution, (cell, ...)), ...) sorted by resolution, ready to bind as IN-lists
+CoverPlan = Tuple[Tuple[int, Tuple[str, ...]], ...]
+
+
+class KRing(NamedTuple):
+    origin: str
+    k: int
+    cells: Tuple[str, ...]
+    cover: CoverPlan
 
 
 def get_h3_index(latitude: float, longitude: float):
     return latlng_to_cell(latitude, longitude, H3_RESOLUTION)
 
-def get_k_ring(latitude: float, longitude: float, radius: int):
+def get_parent_cells(h3_index: str) -> Dict[str, str]:
+    """Column values for the stored parent resolutions of a res-8 cell"""
+    return {H3_COLUMNS[res]: cell_to_parent(h3_index, res) for res in H3_PARENT_RESOLUTIONS}
+
+def plan_cover(h3_indices) -> CoverPlan:
+    """
+    Compact a res-8 covering set into mixed-resolution cells, grouped by resolution.
+    Cells coarser than the coarsest stored parent are expanded back to it.
+    """
+    coarsest = min(H3_PARENT_RESOLUTIONS)
+    plan = defaultdict(list)
+    for cell in compact_cells(list(h3_indices)):
+        res = get_resolution(cell)
+        if res < coarsest:
+            plan[coarsest].extend(cell_to_children(cell, coarsest))
+        else:
+            plan[res].append(cell)
+    return tuple((res, tuple(cells)) for res, cells in sorted(plan.items()))
+
+@lru_cache(maxsize=K_RING_CACHE_SIZE)
+def k_ring_for_cell(origin: str, k: int) -> KRing:
+    """Memoized disk and compacted cover around a res-8 cell; results are immutable and shared"""
+    cells = tuple(grid_disk(origin, k))
+    return KRing(origin, k, cells, plan_cover(cells))
+
+@lru_cache(maxsize=K_RING_CACHE_SIZE)
+def cell_circumradius_km(cell: str) -> float:
+    center = cell_to_latlng(cell)
+    return max(great_circle_distance(center, vertex, "km") for vertex in cell_to_boundary(cell))
+
+def k_for_radius(origin: str, radius_km: float) -> int:
+    """Smallest k whose disk around origin holds every point within radius_km of anywhere in origin"""
+    circumradius = cell_circumradius_km(origin)
+    return max(1, math.ceil((radius_km + circumradius) / (RING_STEP_CIRCUMRADII * circumradius)))
+
+def get_ring(latitude: float, longitude: float, radius_km: float) -> KRing:
     origin = get_h3_index(latitude, longitude)
-    return grid_disk(origin, RADIUS_K_MAP.get(radius))
+    return k_ring_for_cell(origin, k_for_radius(origin, radius_km))
+
+def get_k_ring(latitude: float, longitude: float, radius_km: float) -> Tuple[str, ...]:
+    return get_ring(latitude, longitude, radius_km).cells
+
+def get_k_rings(points: Iterable[Tuple[float, float]], radius_km: float) -> Tuple[str, ...]:
+    """Deduplicated union of the k-rings around several (latitude, longitude) points"""
+    origins = {get_h3_index(latitude, longitude) for latitude, longitude in points}
+    union = set()
+    for origin in origins:
+        union.update(k_ring_for_cell(origin, k_for_radius(origin, radius_km)).cells)
+    return tuple(sorted(union))
+
+def cover_filter(model, cover: CoverPlan):
+    """OR of one IN-list per resolution, each probing that resolution's indexed column"""
+    return or_(*[getattr(model, H3_COLUMNS[res]).in_(cells) for res, cells in cover])
+
+def k_ring_cache_stats() -> dict:
+    info = k_ring_for_cell.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_ratio": round(info.hits / lookups, 4) if lookups else 0.0,
+    }
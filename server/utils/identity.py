@@ -0,0 +1,125 @@
+# AgriCare/server/utils/identity.py
+
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import Config
+from models.user import User
+from models.farmer import Farmer
+from models.labour import Labour
+
+
+class Identity(NamedTuple):
+    user_id: int
+    role: str      # "farmer" | "labour"
+    role_id: int   # farmers.id or labours.id, as put in the token's id claim
+
+
+IdentityKey = Tuple[str, int]
+
+
+class IdentityCache:
+    """Bounded LRU of (role, role_id) -> Identity; entries expire after ttl seconds"""
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[IdentityKey, Tuple[float, Identity]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: IdentityKey) -> Optional[Identity]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, identity: Identity):
+        key = (identity.role, identity.role_id)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, identity)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached identity of an account; ORM changes do this on commit, Core DELETE/UPDATE must call it"""
+        for key in [key for key, (_, identity) in self._entries.items() if identity.user_id == user_id]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+identity_cache = IdentityCache(Config.AUTH_IDENTITY_CACHE_SIZE, Config.AUTH_IDENTITY_CACHE_TTL_SECONDS)
+
+_ROLE_TABLES = {"farmer": Farmer, "labour": Labour}
+
+
+def _identity_changes(session: Session):
+    """Accounts whose identity this flush changes: deleted users/farmers/labours and users whose role changed"""
+    for instance in session.deleted:
+        if isinstance(instance, User):
+            yield instance.id
+        elif isinstance(instance, (Farmer, Labour)):
+            yield instance.user_id
+    for instance in session.dirty:
+        if isinstance(instance, User) and inspect(instance).attrs.role.history.has_changes():
+            yield instance.id
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_identity_changes(session, flush_context):
+    changed = set(_identity_changes(session))
+    if changed:
+        session.info.setdefault("identity_changes", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_identities(session):
+    for user_id in session.info.pop("identity_changes", ()):
+        identity_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_identity_changes(session):
+    session.info.pop("identity_changes", None)
+
+
+async def resolve_identity(db: AsyncSession, claims: dict) -> Identity:
+    """Map verified token claims to the account, hitting the DB only on a cache miss"""
+    role = claims.get("role")
+    model = _ROLE_TABLES.get(role)
+    try:
+        role_id = int(claims["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(401, "Invalid token!")
+    if model is None:
+        raise HTTPException(401, "Invalid token!")
+
+    identity = identity_cache.get((role, role_id))
+    if identity is not None:
+        return identity
+
+    user_id = await db.scalar(select(model.user_id).where(model.id == role_id))
+    if user_id is None:
+        raise HTTPException(status_code=404, detail=f"{role.capitalize()} not found")
+
+    identity = Identity(user_id=user_id, role=role, role_id=role_id)
+    identity_cache.put(identity)
+    return identity
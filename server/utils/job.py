@@ -1,22 +1,120 @@
 # AgriCare/server/utils/job.py
 
-from schemas.job import JobBase, JobResponse
-from sqlalchemy.orm import Session
-from models.job import Job
-from models.farmer import Farmer
-from utils.location import reverse_geocode
-from utils.geogrid import get_h3_index
+import asyncio
+from schemas.job import JobBase, JobResponse, JobSummary
+from schemas.bulk import BulkCreateResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import primary_session
+from models.job import Job, STATUS_MAP
+from utils.location import reverse_geocode, reverse_geocode_many
+from utils.bulk import validate_items, bulk_response
+from utils.geogrid import get_h3_index, get_parent_cells, cover_filter
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
-from utils.geogrid import get_k_ring
-from typing import List
-from sqlalchemy.orm import joinedload
+from utils.geogrid import get_ring, KRing
+from typing import List, NamedTuple, Optional, Tuple
+from datetime import datetime, timezone
+from sqlalchemy import ARRAY, String, cast, insert, or_, select
+from utils.spatial_index import JobRecord, JOB_RECORD_SELECT, job_index, job_record, job_record_from_row, farmer_name
+from utils.record_json import RecordEncoder
+from utils.distance import rank_by_distance
+from utils.nearby_cache import bump_cell_version, cache_key, cached_records
+from utils.job_feed import job_feed
 
-async def create_job(farmer_id: int, job_data: JobBase, db: Session):
+# Nearby pages go out as JSON built straight from the records
+nearby_job_json = RecordEncoder(JobRecord, JobResponse)
+
+class JobFilters(NamedTuple):
+    """Nearby-job filters; the same predicate runs as SQL and against index records"""
+    skills: Tuple[str, ...] = ()
+    min_wage: Optional[float] = None
+    max_wage: Optional[float] = None
+    start_from: Optional[datetime] = None
+    start_to: Optional[datetime] = None
+    status: int = STATUS_MAP["open"]
+
+    def cache_tag(self) -> str:
+        return ";".join(f"{name}={value}" for name, value in zip(self._fields, self) if value not in (None, ()))
+
+    def clauses(self, now: datetime) -> list:
+        clauses = [Job.status == self.status]
+        if self.status == STATUS_MAP["open"]:
+            clauses.append(or_(Job.end_date.is_(None), Job.end_date >= now))
+        if self.skills:
+            clauses.append(Job.required_skills.op("&&")(cast(list(self.skills), ARRAY(String))))
+        if self.min_wage is not None:
+            clauses.append(Job.daily_wage >= self.min_wage)
+        if self.max_wage is not None:
+            clauses.append(Job.daily_wage <= self.max_wage)
+        if self.start_from is not None:
+            clauses.append(Job.start_date >= self.start_from)
+        if self.start_to is not None:
+            clauses.append(Job.start_date <= self.start_to)
+        return clauses
+
+    def matches(self, record: JobRecord, now: datetime) -> bool:
+        if record.status != self.status:
+            return False
+        if self.status == STATUS_MAP["open"] and record.end_date is not None and record.end_date < now:
+            return False
+        if self.skills and not set(record.required_skills or ()).intersection(self.skills):
+            return False
+        if self.min_wage is not None and record.daily_wage < self.min_wage:
+            return False
+        if self.max_wage is not None and record.daily_wage > self.max_wage:
+            return False
+        if self.start_from is not None and record.start_date < self.start_from:
+            return False
+        if self.start_to is not None and record.start_date > self.start_to:
+            return False
+        return True
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Job dates are stored as naive timestamps; compare query bounds the same way"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _job_values(farmer_id: int, job_data: JobBase, location: str) -> dict:
+    h3_index = get_h3_index(job_data.latitude, job_data.longitude)
+    return dict(
+        title=job_data.title,
+        farmer_id=farmer_id,
+        description=job_data.description,
+        number_of_labourers=job_data.number_of_labourers,
+        required_skills=job_data.required_skills,
+        latitude=job_data.latitude,
+        longitude=job_data.longitude,
+        daily_wage=job_data.daily_wage,
+        perks=job_data.perks,
+        start_date=naive_utc(job_data.start_date),
+        end_date=naive_utc(job_data.end_date),
+        status=job_data.status,
+        h3_index=h3_index,
+        **get_parent_cells(h3_index),
+        location=location
+    )
+
+
+async def _announce_jobs(jobs: List[Job], farmer_id: int, db: AsyncSession):
+    """Invalidate cached rings, index open jobs and push them to nearby subscribers"""
+    await asyncio.gather(*(bump_cell_version(cell) for cell in {job.h3_index for job in jobs}))
+    open_jobs = [job for job in jobs if job.status == STATUS_MAP["open"]]
+    if not open_jobs:
+        return
+    name = await farmer_name(db, farmer_id)
+    records = [job_record(job, name) for job in open_jobs]
+    await job_index.upsert_all(records)
+    await asyncio.gather(*(
+        job_feed.publish(record.h3_index, {"type": "created", "job": JobResponse(**record._asdict()).model_dump(mode="json")})
+        for record in records
+    ))
+
+
+async def create_job(farmer_id: int, job_data: JobBase, db: AsyncSession):
     try:
-        
-        h3_index = get_h3_index(job_data.latitude, job_data.longitude)
-        
         # Try to get location address, use fallback if it fails
         try:
             location = await reverse_geocode(job_data.latitude, job_data.longitude)
@@ -24,88 +122,108 @@ async def create_job(farmer_id: int, job_data: JobBase, db: Session):
             print(f"⚠️ Using fallback location due to geocoding error: {e}")
             location = f"Location: {job_data.latitude:.4f}, {job_data.longitude:.4f}"
             
-        new_job = Job(
-            title=job_data.title,
-            farmer_id=farmer_id,
-            description=job_data.description,
-            number_of_labourers=job_data.number_of_labourers,
-            required_skills=job_data.required_skills,
-            latitude=job_data.latitude,
-            longitude=job_data.longitude,
-            daily_wage=job_data.daily_wage,
-            perks=job_data.perks,
-            start_date=job_data.start_date,
-            end_date=job_data.end_date,
-            status=job_data.status,
-            h3_index=h3_index,
-            location=location
-        )
+        new_job = Job(**_job_values(farmer_id, job_data, location))
 
         db.add(new_job)
-        db.commit()
-        db.refresh(new_job)
+        await db.commit()
+        await db.refresh(new_job)
+
+        await _announce_jobs([new_job], farmer_id, db)
 
         return {"message": "Job created successfully."}
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         print(f"❌ Database error: {e}")
         raise HTTPException(status_code=500, detail=f"Database error.{e} Failed to create job.")
 
 
-async def get_jobs(farmer_id: int, db: Session)-> List[Job]:
+async def create_jobs_bulk(farmer_id: int, items: List[dict], db: AsyncSession) -> BulkCreateResponse:
+    """
+    Validate every item, geocode the valid ones concurrently and insert them in one
+    transaction as a single executemany INSERT .. RETURNING; invalid items are reported, not inserted.
+    """
+    valid, rejected = validate_items(items, JobBase)
+    if not valid:
+        return bulk_response(valid, [], rejected)
+
+    locations = await reverse_geocode_many([(job_data.latitude, job_data.longitude) for _, job_data in valid])
+    rows = [_job_values(farmer_id, job_data, location) for (_, job_data), location in zip(valid, locations)]
     try:
-        jobs = db.query(Job).filter(Job.farmer_id==farmer_id).all()
-        return jobs
+        jobs = (await db.scalars(insert(Job).returning(Job, sort_by_parameter_order=True), rows)).all()
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        print(f"❌ Database error: {e}")
+        raise HTTPException(status_code=500, detail="Database error. Failed to create jobs.")
+
+    await _announce_jobs(jobs, farmer_id, db)
+    return bulk_response(valid, [job.id for job in jobs], rejected)
+
+
+async def get_jobs(farmer_id: int, db: AsyncSession, limit: int = 50, cursor: Optional[int] = None,
+                   summary: bool = False) -> Tuple[list, Optional[str]]:
+    """One page of a farmer's jobs, newest first; the cursor is the last id already seen"""
+    try:
+        columns = [getattr(Job, name) for name in JobSummary.model_fields] if summary else [Job]
+        query = select(*columns).where(Job.farmer_id == farmer_id)
+        if cursor is not None:
+            query = query.where(Job.id < cursor)
+        query = query.order_by(Job.id.desc()).limit(limit + 1)
+        rows = (await db.execute(query)).all() if summary else (await db.scalars(query)).all()
+
+        next_cursor = str(rows[limit - 1].id) if len(rows) > limit else None
+        rows = rows[:limit]
+        return ([JobSummary.model_validate(row) for row in rows] if summary else rows), next_cursor
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail="Database error. Failed to fetch jobs.")
     
 
-async def delete_job(job_id: int, farmer_id: int, db: Session):
+async def delete_job(job_id: int, farmer_id: int, db: AsyncSession):
     try:
-        job = db.query(Job).filter(Job.id == job_id, Job.farmer_id == farmer_id).first()
+        job = await db.scalar(select(Job).where(Job.id == job_id, Job.farmer_id == farmer_id))
 
         if not job:
             raise HTTPException(status_code=404, detail="Job not found.")
 
-        db.delete(job)
-        db.commit()
+        await db.delete(job)
+        await db.commit()
+        await job_index.remove_all([job_id])
+        await bump_cell_version(job.h3_index)
+        await job_feed.publish(job.h3_index, {"type": "removed", "job_id": job_id})
         return {"message": "Job deleted successfully."}
 
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Database error. Failed to delete job.")
     
 
-async def nearby_jobs(latitude: float, longitude: float, k: int, db: Session) -> List[JobResponse]:
+async def nearby_job_records(ring: KRing, filters: JobFilters, now: datetime, db: AsyncSession) -> List[JobRecord]:
+    """Jobs in the ring's cells that pass the filters, before any distance cut"""
+    # Answer from the in-memory index once it has been warmed; it only holds open jobs
+    if job_index.ready and filters.status == STATUS_MAP["open"]:
+        return [record for record in job_index.query(ring.cells) if filters.matches(record, now)]
+
+    async def load() -> List[JobRecord]:
+        # The result is cached under the cell versions read just before; only the primary is sure to reflect them
+        async with primary_session(db) as primary:
+            rows = await primary.execute(JOB_RECORD_SELECT.where(cover_filter(Job, ring.cover), *filters.clauses(now)))
+        return list(map(JobRecord._make, rows))
+
+    key = cache_key("jobs", ring.origin, ring.k, filters.cache_tag())
+    cached = await cached_records(key, ring.cells, load, job_record_from_row)
+    # Cached entries can outlive a job's end_date, so re-check expiry on the way out
+    return [record for record in cached if filters.matches(record, now)]
+
+
+async def nearby_jobs(latitude: float, longitude: float, k: int, db: AsyncSession,
+                      limit: int = 50, cursor: Optional[str] = None,
+                      filters: JobFilters = JobFilters()) -> Tuple[List[Tuple[JobRecord, float]], Optional[str]]:
+    """One page of (record, distance_km), nearest first; serialize it with nearby_job_json"""
     try:
-        h3_indices = get_k_ring(latitude, longitude, k)
-        jobs = (
-            db.query(Job)
-            .options(joinedload(Job.farmer).joinedload(Farmer.user))
-            .filter(Job.h3_index.in_(h3_indices))
-            .all()
-        )
-
-        return [
-            JobResponse(
-                id=job.id,
-                title=job.title,
-                description=job.description,
-                number_of_labourers=job.number_of_labourers,
-                required_skills=job.required_skills,
-                latitude=job.latitude,
-                longitude=job.longitude,
-                daily_wage=float(job.daily_wage),
-                perks=job.perks,
-                start_date=job.start_date,
-                end_date=job.end_date,
-                status=job.status,
-                location=job.location,
-                h3_index=job.h3_index,
-                farmer_name=job.farmer.user.name,
-                farmer_id=job.farmer_id
-            )
-            for job in jobs
-        ]
+        ring = get_ring(latitude, longitude, k)
+        records = await nearby_job_records(ring, filters, naive_utc(datetime.now(timezone.utc)), db)
+
+        # The k-ring over-covers the radius; keep true distances only, nearest first
+        return rank_by_distance(records, latitude, longitude, k, limit, cursor)
     except SQLAlchemyError:
-        raise HTTPException(status_code=500, detail="Database error. Failed to fetch nearby jobs.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Database error. Failed to fetch nearby jobs.")
@@ -0,0 +1,200 @@
+# AgriCare/server/utils/job_feed.py
+
+import asyncio
+import json
+from typing import Callable, Dict, Iterable, Optional, Set
+from fastapi import WebSocket, WebSocketDisconnect
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from utils.redis import redis
+
+CHANNEL_PREFIX = "jobs:cell:"
+SUBSCRIBER_QUEUE_SIZE = 100
+SSE_HEARTBEAT_SECONDS = 15
+REDIS_RETRY_SECONDS = 5
+# How long one pub/sub read waits for a message; an idle channel just yields None
+LISTEN_POLL_SECONDS = 0.5
+
+
+class Subscription:
+    """One client's view of the feed: the res-8 cells it watches and its pending messages"""
+    def __init__(self, cells: Iterable[str]):
+        self.cells = frozenset(cells)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def offer(self, message: str):
+        # A slow client loses its oldest messages rather than holding up the fan-out
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self) -> str:
+        return await self.queue.get()
+
+
+class CellBus:
+    """In-process fan-out from an H3 cell to the subscriptions that cover it"""
+    def __init__(self):
+        self.by_cell: Dict[str, Set[Subscription]] = {}
+        self.subscriptions = 0
+        self.delivered = 0
+
+    def subscribe(self, cells: Iterable[str]) -> Subscription:
+        subscription = Subscription(cells)
+        for cell in subscription.cells:
+            self.by_cell.setdefault(cell, set()).add(subscription)
+        self.subscriptions += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for cell in subscription.cells:
+            subscribers = self.by_cell.get(cell)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.by_cell[cell]
+        self.subscriptions -= 1
+
+    def deliver(self, cell: str, message: str) -> int:
+        subscribers = self.by_cell.get(cell, ())
+        for subscription in subscribers:
+            subscription.offer(message)
+        self.delivered += len(subscribers)
+        return len(subscribers)
+
+
+class JobFeed:
+    """
+    Publishes job events to per-cell topics. With a reachable Redis every process
+    pattern-subscribes to the cell channels and routes messages to its local bus;
+    otherwise events go straight to the in-process bus.
+    """
+    def __init__(self):
+        self.bus = CellBus()
+        self.published = 0
+        self._listener: Optional[asyncio.Task] = None
+        self._redis_live = False
+        # Plain channels other modules share state on, e.g. spatial index changes
+        self._handlers: Dict[str, Callable[[str], None]] = {}
+
+    def subscribe(self, cells: Iterable[str]) -> Subscription:
+        return self.bus.subscribe(cells)
+
+    def unsubscribe(self, subscription: Subscription):
+        self.bus.unsubscribe(subscription)
+
+    def on_broadcast(self, channel: str, handler: Callable[[str], None]):
+        """Hand every message broadcast on channel, by any process, to handler; register before start()"""
+        self._handlers[channel] = handler
+
+    async def broadcast(self, channel: str, message: str):
+        """Reach the handlers in other processes; without Redis there are none to reach"""
+        if self._redis_live and redis.is_remote:
+            try:
+                await redis.publish(channel, message)
+            except Exception as e:
+                print(f"⚠️ Job feed broadcast on {channel} failed: {e}")
+
+    async def start(self):
+        if redis.is_remote:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        self._redis_live = False
+
+    async def publish(self, cell: str, event: dict):
+        message = json.dumps(event)
+        self.published += 1
+        if self._redis_live and redis.is_remote:
+            try:
+                await redis.publish(CHANNEL_PREFIX + cell, message)
+                return
+            except Exception as e:
+                print(f"⚠️ Job feed publish failed, delivering locally: {e}")
+        self.bus.deliver(cell, message)
+
+    async def _listen(self):
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.psubscribe(CHANNEL_PREFIX + "*")
+                if self._handlers:
+                    await pubsub.subscribe(*self._handlers)
+                self._redis_live = True
+                print("✅ Job feed subscribed to Redis cell channels")
+                while True:
+                    # Poll with our own read timeout: listen() would hit the client's socket_timeout on idle channels
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=LISTEN_POLL_SECONDS)
+                    if message is None:
+                        continue
+                    if message["type"] == "pmessage":
+                        self.bus.deliver(message["channel"][len(CHANNEL_PREFIX):], message["data"])
+                    elif message["type"] == "message":
+                        self._handle(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except (RedisConnectionError, RedisTimeoutError, OSError) as e:
+                print(f"⚠️ Job feed lost Redis, using in-process delivery: {e}")
+            except Exception as e:
+                print(f"❌ Job feed listener failed, resubscribing: {e}")
+            finally:
+                self._redis_live = False
+                await pubsub.aclose()
+            await asyncio.sleep(REDIS_RETRY_SECONDS)
+
+    def _handle(self, channel: str, message: str):
+        try:
+            self._handlers[channel](message)
+        except Exception as e:
+            print(f"⚠️ Job feed handler for {channel} failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "transport": "redis" if self._redis_live else "in-process",
+            "subscriptions": self.bus.subscriptions,
+            "watched_cells": len(self.bus.by_cell),
+            "published": self.published,
+            "delivered": self.bus.delivered,
+        }
+
+
+job_feed = JobFeed()
+
+
+async def serve_websocket(websocket: WebSocket, subscription: Subscription):
+    """Forward feed messages until the client goes away"""
+    async def wait_for_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    disconnected = asyncio.create_task(wait_for_disconnect())
+    try:
+        while True:
+            message = asyncio.create_task(subscription.get())
+            await asyncio.wait({message, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                message.cancel()
+                break
+            await websocket.send_text(message.result())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        job_feed.unsubscribe(subscription)
+
+
+async def sse_stream(subscription: Subscription):
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), SSE_HEARTBEAT_SECONDS)
+                yield f"data: {message}\n\n"
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        job_feed.unsubscribe(subscription)
@@ -0,0 +1,76 @@
+# AgriCare/server/utils/labour.py
+
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException
+from models.labour import Labour
+from schemas.labour import LabourProfile, MatchedJobResponse
+from utils.geogrid import get_ring
+from utils.job import JobFilters, naive_utc, nearby_job_records
+from utils.matching import MatchProfile, top_matches
+
+
+async def _get_labour(labour_id: int, db: AsyncSession) -> Labour:
+    labour = await db.get(Labour, labour_id)
+    if not labour:
+        raise HTTPException(status_code=404, detail="Labour not found")
+    return labour
+
+
+def _to_profile(labour: Labour) -> LabourProfile:
+    return LabourProfile(
+        skills=labour.skills or [],
+        latitude=labour.latitude,
+        longitude=labour.longitude,
+        max_distance_km=labour.max_distance_km,
+        min_wage=float(labour.min_wage) if labour.min_wage is not None else None,
+    )
+
+
+async def get_profile(labour_id: int, db: AsyncSession) -> LabourProfile:
+    try:
+        return _to_profile(await _get_labour(labour_id, db))
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error. Failed to fetch profile.")
+
+
+async def update_profile(labour_id: int, profile: LabourProfile, db: AsyncSession) -> LabourProfile:
+    try:
+        labour = await _get_labour(labour_id, db)
+        labour.skills = sorted({skill.strip() for skill in profile.skills if skill.strip()})
+        labour.latitude = profile.latitude
+        labour.longitude = profile.longitude
+        labour.max_distance_km = profile.max_distance_km
+        labour.min_wage = profile.min_wage
+        await db.commit()
+        return _to_profile(labour)
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error. Failed to update profile.")
+
+
+async def matched_jobs(labour_id: int, db: AsyncSession, limit: int = 20,
+                       latitude: Optional[float] = None, longitude: Optional[float] = None) -> List[MatchedJobResponse]:
+    try:
+        labour = await _get_labour(labour_id, db)
+
+        # Current position from the app wins over the stored home location
+        if latitude is None or longitude is None:
+            latitude, longitude = labour.latitude, labour.longitude
+        if latitude is None or longitude is None:
+            raise HTTPException(status_code=400, detail="Set a location in your profile or pass latitude and longitude.")
+
+        now = naive_utc(datetime.now(timezone.utc))
+        filters = JobFilters(min_wage=float(labour.min_wage) if labour.min_wage is not None else None)
+        ring = get_ring(latitude, longitude, labour.max_distance_km)
+        records = await nearby_job_records(ring, filters, now, db)
+
+        profile = MatchProfile(latitude, longitude, labour.max_distance_km, tuple(labour.skills or ()))
+        return [
+            MatchedJobResponse(**record._asdict(), distance_km=round(distance, 3), match_score=round(score, 4))
+            for record, score, distance in top_matches(records, profile, now, limit)
+        ]
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error. Failed to fetch matched jobs.")
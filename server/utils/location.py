@@ -1,5 +1,7 @@
 # AgriCare/server/utils/location.py
 
+import asyncio
+from typing import List, Sequence, Tuple
 from config import Config
 from utils.httpx import get_http_client
 
@@ -30,4 +32,15 @@ async def reverse_geocode(latitude: float, longitude: float) -> str:
         return f"Location: {latitude:.4f}, {longitude:.4f}"
 
 
+async def reverse_geocode_many(points: Sequence[Tuple[float, float]],
+                               concurrency: int = Config.GEOCODE_CONCURRENCY) -> List[str]:
+    """Geocode a batch of (lat, lng) with at most `concurrency` lookups in flight; repeated points are looked up once"""
+    semaphore = asyncio.Semaphore(concurrency)
 
+    async def lookup(latitude: float, longitude: float) -> str:
+        async with semaphore:
+            return await reverse_geocode(latitude, longitude)
+
+    unique = list(dict.fromkeys(points))
+    addresses = dict(zip(unique, await asyncio.gather(*(lookup(*point) for point in unique))))
+    return [addresses[point] for point in points]
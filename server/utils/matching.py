@@ -0,0 +1,94 @@
+# AgriCare/server/utils/matching.py
+
+from datetime import datetime
+from itertools import chain
+from operator import itemgetter
+from typing import List, NamedTuple, Sequence, Tuple
+import numpy as np
+from utils.distance import haversine_km
+from utils.spatial_index import JobRecord
+
+# Relative weight of each signal in the final score; each signal is scaled to [0, 1]
+WEIGHTS = {"distance": 0.35, "skills": 0.35, "wage": 0.2, "start": 0.1}
+# A job starting this many days out scores half of one starting today
+START_HALF_LIFE_DAYS = 7.0
+# Skill score for jobs that do not list any required skills
+OPEN_SKILLS_SCORE = 0.5
+
+_FIELD = {name: itemgetter(i) for i, name in enumerate(JobRecord._fields)}
+
+
+class MatchProfile(NamedTuple):
+    latitude: float
+    longitude: float
+    radius_km: float
+    skills: Tuple[str, ...] = ()
+
+
+class JobColumns(NamedTuple):
+    """Candidate jobs laid out as arrays, one entry per record"""
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    wages: np.ndarray
+    start_days: np.ndarray
+    skill_counts: np.ndarray
+    skills: List[str]
+
+    @classmethod
+    def from_records(cls, records: Sequence[JobRecord]) -> "JobColumns":
+        count = len(records)
+        skill_lists = [skills or () for skills in map(_FIELD["required_skills"], records)]
+        return cls(
+            latitudes=np.fromiter(map(_FIELD["latitude"], records), dtype=np.float64, count=count),
+            longitudes=np.fromiter(map(_FIELD["longitude"], records), dtype=np.float64, count=count),
+            wages=np.fromiter(map(_FIELD["daily_wage"], records), dtype=np.float64, count=count),
+            start_days=np.fromiter(map(datetime.toordinal, map(_FIELD["start_date"], records)), dtype=np.int64, count=count),
+            skill_counts=np.fromiter(map(len, skill_lists), dtype=np.int64, count=count),
+            skills=list(chain.from_iterable(skill_lists)),
+        )
+
+
+def score_jobs(columns: JobColumns, profile: MatchProfile, now: datetime) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every candidate in one vectorized pass. Returns (scores, distances_km);
+    candidates outside the profile's radius score -inf.
+    """
+    count = len(columns.latitudes)
+    distances = haversine_km(profile.latitude, profile.longitude, columns.latitudes, columns.longitudes)
+    distance_score = np.clip(1.0 - distances / profile.radius_km, 0.0, 1.0)
+
+    # Share of each job's required skills the labourer has
+    wanted = frozenset(profile.skills)
+    hits = np.fromiter(map(wanted.__contains__, columns.skills), dtype=np.float64, count=len(columns.skills))
+    owners = np.repeat(np.arange(count), columns.skill_counts)
+    matched = np.bincount(owners, weights=hits, minlength=count)
+    skill_score = np.where(columns.skill_counts > 0, matched / np.maximum(columns.skill_counts, 1), OPEN_SKILLS_SCORE)
+
+    top_wage = columns.wages.max() if count else 0.0
+    wage_score = columns.wages / top_wage if top_wage > 0 else np.zeros(count)
+
+    days_out = np.maximum(columns.start_days - now.toordinal(), 0)
+    start_score = np.exp2(-days_out / START_HALF_LIFE_DAYS)
+
+    scores = (
+        WEIGHTS["distance"] * distance_score
+        + WEIGHTS["skills"] * skill_score
+        + WEIGHTS["wage"] * wage_score
+        + WEIGHTS["start"] * start_score
+    )
+    scores[distances > profile.radius_km] = -np.inf
+    return scores, distances
+
+
+def top_matches(records: Sequence[JobRecord], profile: MatchProfile, now: datetime,
+                limit: int) -> List[Tuple[JobRecord, float, float]]:
+    """Best `limit` candidates as (record, score, distance_km), highest score first"""
+    if not records:
+        return []
+
+    scores, distances = score_jobs(JobColumns.from_records(records), profile, now)
+    in_range = np.flatnonzero(np.isfinite(scores))
+    if len(in_range) > limit:
+        in_range = in_range[np.argpartition(-scores[in_range], limit - 1)[:limit]]
+    best = in_range[np.argsort(-scores[in_range], kind="stable")]
+    return [(records[i], float(scores[i]), float(distances[i])) for i in best]
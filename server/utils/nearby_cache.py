@@ -0,0 +1,93 @@
+# AgriCare/server/utils/nearby_cache.py
+
+import json
+from datetime import date
+from typing import Awaitable, Callable, List, Sequence
+from utils.redis import redis
+
+CACHE_TTL_SECONDS = 600
+
+
+class NearbyCacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.bypassed = 0
+
+    def to_dict(self) -> dict:
+        lookups = self.hits + self.misses + self.stale
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "bypassed": self.bypassed,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+nearby_cache_stats = NearbyCacheStats()
+
+
+def _version_key(cell: str) -> str:
+    return f"nearby:ver:{cell}"
+
+
+def cache_key(kind: str, origin: str, k: int, filters: str = "") -> str:
+    return f"nearby:{kind}:{origin}:{k}:{filters}"
+
+
+def _encode(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+async def bump_cell_version(cell: str):
+    """Invalidate every cached nearby result whose ring contains this res-8 cell"""
+    if not redis.is_remote:
+        return
+    try:
+        await redis.incr(_version_key(cell))
+    except Exception as e:
+        print(f"⚠️ Failed to bump nearby cache version for {cell}: {e}")
+
+
+async def cached_records(key: str, cells: Sequence[str], load: Callable[[], Awaitable[List]],
+                         to_record: Callable[[dict], object]) -> List:
+    """
+    Candidate records for a ring, read from Redis while every cell's version
+    still matches the versions captured before the records were loaded.
+    The entry and all versions come back in a single MGET. Without a shared
+    Redis the versions would be per process, so every call goes to the database.
+    """
+    if not redis.is_remote:
+        nearby_cache_stats.bypassed += 1
+        return await load()
+    try:
+        values = await redis.mget([key] + [_version_key(cell) for cell in cells])
+    except Exception as e:
+        print(f"⚠️ Nearby cache unavailable: {e}")
+        return await load()
+
+    cached, versions = values[0], [int(value) if value else 0 for value in values[1:]]
+    if cached is not None:
+        entry = json.loads(cached)
+        if entry["versions"] == versions:
+            nearby_cache_stats.hits += 1
+            return [to_record(row) for row in entry["rows"]]
+        nearby_cache_stats.stale += 1
+    else:
+        nearby_cache_stats.misses += 1
+
+    # Versions were read before loading, so a write racing this load leaves the entry stale
+    records = await load()
+    if not redis.is_remote:
+        # Redis failed during this call and the wrapper switched to its per-process fallback
+        return records
+    try:
+        payload = json.dumps({"versions": versions, "rows": [record._asdict() for record in records]}, default=_encode)
+        await redis.setex(key, CACHE_TTL_SECONDS, payload)
+    except Exception as e:
+        print(f"⚠️ Failed to store nearby cache entry: {e}")
+    return records
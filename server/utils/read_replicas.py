@@ -0,0 +1,129 @@
+# AgriCare/server/utils/read_replicas.py
+
+import asyncio
+import time
+from collections import OrderedDict
+from itertools import count
+from typing import List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Callers whose recent writes we remember; the oldest are forgotten first
+RECENT_WRITERS_MAX = 50000
+HEALTH_CHECK_TIMEOUT_SECONDS = 2.0
+_LAG_QUERY = text("SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())")
+
+
+class Replica:
+    __slots__ = ("name", "engine", "healthy", "lag_seconds", "last_error", "reads")
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.reads = 0
+
+
+class ReplicaPool:
+    """
+    Round-robins reads over the healthy replicas and hands back the primary when
+    none is usable. A replica is taken out as soon as one of its connections
+    drops and is put back by the periodic health check once it answers again
+    within the allowed replication lag.
+    """
+    def __init__(self, primary: AsyncEngine, replicas: List[AsyncEngine], max_lag_seconds: float):
+        self.primary = primary
+        self.replicas = [Replica(engine.url.render_as_string(hide_password=True), engine) for engine in replicas]
+        self.max_lag_seconds = max_lag_seconds
+        self.primary_reads = 0
+        self._turn = count()
+        for replica in self.replicas:
+            self._watch_errors(replica)
+
+    def _watch_errors(self, replica: Replica):
+        @event.listens_for(replica.engine.sync_engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect:
+                self._mark_down(replica, context.original_exception)
+
+    def _mark_down(self, replica: Replica, error: BaseException):
+        if replica.healthy:
+            print(f"⚠️ Read replica {replica.name} marked unhealthy: {error}")
+        replica.healthy = False
+        replica.last_error = str(error)[:200]
+
+    def report_failure(self, engine: AsyncEngine, error: BaseException):
+        """Take a replica out after a failure the driver raised outside SQLAlchemy (refused connects, timeouts)"""
+        for replica in self.replicas:
+            if replica.engine is engine:
+                self._mark_down(replica, error)
+
+    def is_replica(self, bind) -> bool:
+        """Whether an engine or connection belongs to one of the replicas"""
+        sync_engine = getattr(bind, "sync_engine", None)
+        return any(replica.engine.sync_engine is sync_engine for replica in self.replicas)
+
+    def pick(self, primary: bool = False) -> AsyncEngine:
+        """Engine for the next read; `primary` pins it there, e.g. for read-your-writes"""
+        healthy = [] if primary else [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            self.primary_reads += 1
+            return self.primary
+        replica = healthy[next(self._turn) % len(healthy)]
+        replica.reads += 1
+        return replica.engine
+
+    async def check(self, replica: Replica):
+        try:
+            async with replica.engine.connect() as conn:
+                lag = await asyncio.wait_for(conn.scalar(_LAG_QUERY), HEALTH_CHECK_TIMEOUT_SECONDS)
+        except Exception as e:
+            self._mark_down(replica, e)
+            return
+        # NULL lag means the server is not replaying WAL (or has replayed nothing yet)
+        replica.lag_seconds = float(lag) if lag is not None else None
+        if replica.lag_seconds is not None and replica.lag_seconds > self.max_lag_seconds:
+            self._mark_down(replica, RuntimeError(f"replication lag {replica.lag_seconds:.1f}s"))
+            return
+        if not replica.healthy:
+            print(f"✅ Read replica {replica.name} is healthy again")
+        replica.healthy = True
+        replica.last_error = None
+
+    async def monitor(self, interval_seconds: float):
+        while True:
+            await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+            await asyncio.sleep(interval_seconds)
+
+    async def dispose(self):
+        await asyncio.gather(*(replica.engine.dispose() for replica in self.replicas))
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {"name": replica.name, "healthy": replica.healthy, "lag_seconds": replica.lag_seconds,
+                 "reads": replica.reads, "last_error": replica.last_error}
+                for replica in self.replicas
+            ],
+            "primary_reads": self.primary_reads,
+        }
+
+
+class RecentWriters:
+    """Callers that committed a write in the last `window_seconds`, so their reads stay on the primary"""
+    def __init__(self, window_seconds: float, max_size: int = RECENT_WRITERS_MAX):
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self._written_at: "OrderedDict[str, float]" = OrderedDict()
+
+    def mark(self, caller: str):
+        self._written_at[caller] = time.monotonic()
+        self._written_at.move_to_end(caller)
+        while len(self._written_at) > self.max_size:
+            self._written_at.popitem(last=False)
+
+    def recent(self, caller: str) -> bool:
+        written_at = self._written_at.get(caller)
+        return written_at is not None and time.monotonic() - written_at < self.window_seconds
@@ -0,0 +1,31 @@
+# AgriCare/server/utils/record_json.py
+
+import json
+from datetime import date, datetime
+from operator import itemgetter
+from typing import List, NamedTuple, Sequence, Tuple, Type
+from pydantic import BaseModel
+
+
+def _encode(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class RecordEncoder:
+    """
+    Writes a page of (record, distance_km) pairs as the JSON array the response
+    model would produce, same keys in the same order, without building a model
+    per row. Formatting matches Starlette's JSONResponse.
+    """
+    def __init__(self, record_type: Type[NamedTuple], response_model: Type[BaseModel]):
+        keys = [name for name in response_model.model_fields if name != "distance_km"]
+        self.keys = (*keys, "distance_km")
+        self._values = itemgetter(*(record_type._fields.index(name) for name in keys))
+
+    def dumps(self, page: Sequence[Tuple[NamedTuple, float]]) -> bytes:
+        keys, values = self.keys, self._values
+        rows: List[dict] = [dict(zip(keys, (*values(record), round(distance, 3)))) for record, distance in page]
+        return json.dumps(rows, default=_encode, ensure_ascii=False, allow_nan=False,
+                          indent=None, separators=(",", ":")).encode("utf-8")
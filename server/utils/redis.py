@@ -3,11 +3,14 @@
 import redis.asyncio as redis_asyncio
 from config import Config
 import logging
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Keys the in-memory fallback holds before it drops expired and then the oldest entries
+IN_MEMORY_MAX_KEYS = 10000
+
 # Wrapper class to handle Redis connection failures gracefully
 class RedisWrapper:
     """Wraps Redis client to auto-fallback on connection errors"""
@@ -51,13 +54,28 @@ class RedisWrapper:
     
     async def delete(self, key: str):
         return await self._try_operation(lambda client, k: client.delete(k), key)
+    
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return await self._try_operation(lambda client, ks: client.mget(ks), keys)
+    
+    async def publish(self, channel: str, message: str) -> int:
+        return await self._try_operation(lambda client, c, m: client.publish(c, m), channel, message)
+    
+    @property
+    def is_remote(self) -> bool:
+        """True while a real Redis server is in use, so pub/sub reaches other processes"""
+        return not self.use_fallback and not isinstance(self.redis_client, InMemoryRedis)
+    
+    def pubsub(self):
+        return self.redis_client.pubsub()
 
 # In-memory fallback storage
 class InMemoryRedis:
     """Fallback in-memory storage when Redis is unavailable"""
-    def __init__(self):
+    def __init__(self, max_keys: int = IN_MEMORY_MAX_KEYS):
         self._store = {}
         self._expiry = {}
+        self.max_keys = max_keys
         logger.warning("🔴 Redis unavailable - using in-memory storage (OTPs won't persist across server restarts)")
     
     async def get(self, key: str) -> Optional[str]:
@@ -67,13 +85,30 @@ class InMemoryRedis:
             return None
         return self._store.get(key)
     
+    def _evict(self):
+        """Keep the store bounded: expired keys go first, then the oldest written"""
+        if len(self._store) < self.max_keys:
+            return
+        now = datetime.now()
+        for key in [key for key, expires_at in self._expiry.items() if expires_at < now]:
+            del self._store[key]
+            del self._expiry[key]
+        while len(self._store) >= self.max_keys:
+            key = next(iter(self._store))
+            del self._store[key]
+            self._expiry.pop(key, None)
+    
     async def setex(self, key: str, seconds: int, value: str):
+        self._store.pop(key, None)
+        self._evict()
         self._store[key] = value
         self._expiry[key] = datetime.now() + timedelta(seconds=seconds)
     
     async def incr(self, key: str) -> int:
         current = await self.get(key)
         new_value = (int(current) if current else 0) + 1
+        if current is None:
+            self._evict()
         self._store[key] = str(new_value)
         return new_value
     
@@ -90,6 +125,13 @@ class InMemoryRedis:
     async def delete(self, key: str):
         self._store.pop(key, None)
         self._expiry.pop(key, None)
+    
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return [await self.get(key) for key in keys]
+    
+    async def publish(self, channel: str, message: str) -> int:
+        # No other processes to reach; in-process subscribers are served by the caller
+        return 0
 
 # Try to use real Redis, but be ready to fall back
 try:
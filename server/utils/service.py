@@ -1,19 +1,50 @@
 # AgriCare/server/utils/service.py
 
-from schemas.service import ServiceBase, ServiceResponse
-from sqlalchemy.orm import Session, joinedload
-from models.service import Service
-from models.farmer import Farmer
-from utils.location import reverse_geocode
-from utils.geogrid import get_h3_index, get_k_ring
+import asyncio
+from schemas.service import ServiceBase, ServiceResponse, ServiceSummary
+from schemas.bulk import BulkCreateResponse
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import primary_session
+from models.service import Service, SERVICE_STATUS
+from utils.location import reverse_geocode, reverse_geocode_many
+from utils.bulk import validate_items, bulk_response
+from utils.geogrid import get_h3_index, get_ring, get_parent_cells, cover_filter
 from fastapi import HTTPException
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List
+from typing import List, Optional, Tuple
+from utils.spatial_index import ServiceRecord, SERVICE_RECORD_SELECT, service_index, service_record, service_record_from_row, farmer_name
+from utils.record_json import RecordEncoder
+from utils.distance import rank_by_distance
+from utils.nearby_cache import bump_cell_version, cache_key, cached_records
 
-async def create_service(farmer_id: int, service_data: ServiceBase, db: Session):
+# Nearby pages go out as JSON built straight from the records
+nearby_service_json = RecordEncoder(ServiceRecord, ServiceResponse)
+
+def _service_values(farmer_id: int, service_data: ServiceBase, location: str) -> dict:
+    h3_index = get_h3_index(service_data.latitude, service_data.longitude)
+    return dict(
+        farmer_id=farmer_id,
+        service_name=service_data.service_name,
+        description=service_data.description,
+        latitude=service_data.latitude,
+        longitude=service_data.longitude,
+        cost=service_data.cost,
+        status=service_data.status,
+        h3_index=h3_index,
+        **get_parent_cells(h3_index),
+        location=location
+    )
+
+async def _announce_services(services: List[Service], farmer_id: int, db: AsyncSession):
+    active = [service for service in services if service.status == SERVICE_STATUS["active"]]
+    if active:
+        name = await farmer_name(db, farmer_id)
+        await service_index.upsert_all(service_record(service, name) for service in active)
+    await asyncio.gather(*(bump_cell_version(cell) for cell in {service.h3_index for service in services}))
+
+async def create_service(farmer_id: int, service_data: ServiceBase, db: AsyncSession):
     try:
-        h3_index = get_h3_index(service_data.latitude, service_data.longitude)
-        
         # Try to get location address, use fallback if it fails
         try:
             location = await reverse_geocode(service_data.latitude, service_data.longitude)
@@ -21,73 +52,96 @@ async def create_service(farmer_id: int, service_data: ServiceBase, db: Session)
             print(f"⚠️ Using fallback location due to geocoding error: {e}")
             location = f"Location: {service_data.latitude:.4f}, {service_data.longitude:.4f}"
 
-        new_service = Service(
-            farmer_id=farmer_id,
-            service_name=service_data.service_name,
-            description=service_data.description,
-            latitude=service_data.latitude,
-            longitude=service_data.longitude,
-            cost=service_data.cost,
-            status=service_data.status,
-            h3_index=h3_index,
-            location=location
-        )
+        new_service = Service(**_service_values(farmer_id, service_data, location))
 
         db.add(new_service)
-        db.commit()
-        db.refresh(new_service)
+        await db.commit()
+        await db.refresh(new_service)
+
+        await _announce_services([new_service], farmer_id, db)
 
         return {"message": "Service created successfully."}
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         print(f"❌ Database error: {e}")
         raise HTTPException(status_code=500, detail="Database error. Failed to create service.")
 
-async def get_services(farmer_id: int, db: Session) -> List[Service]:
+async def create_services_bulk(farmer_id: int, items: List[dict], db: AsyncSession) -> BulkCreateResponse:
+    """Bulk counterpart of create_service: one geocoding fan-out and one executemany INSERT"""
+    valid, rejected = validate_items(items, ServiceBase)
+    if not valid:
+        return bulk_response(valid, [], rejected)
+
+    locations = await reverse_geocode_many([(service_data.latitude, service_data.longitude) for _, service_data in valid])
+    rows = [_service_values(farmer_id, service_data, location) for (_, service_data), location in zip(valid, locations)]
+    try:
+        services = (await db.scalars(insert(Service).returning(Service, sort_by_parameter_order=True), rows)).all()
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        print(f"❌ Database error: {e}")
+        raise HTTPException(status_code=500, detail="Database error. Failed to create services.")
+
+    await _announce_services(services, farmer_id, db)
+    return bulk_response(valid, [service.id for service in services], rejected)
+
+async def get_services(farmer_id: int, db: AsyncSession, limit: int = 50, cursor: Optional[int] = None,
+                       summary: bool = False) -> Tuple[list, Optional[str]]:
+    """One page of a farmer's services, newest first; the cursor is the last id already seen"""
     try:
-        return db.query(Service).filter(Service.farmer_id == farmer_id).all()
+        columns = [getattr(Service, name) for name in ServiceSummary.model_fields] if summary else [Service]
+        query = select(*columns).where(Service.farmer_id == farmer_id)
+        if cursor is not None:
+            query = query.where(Service.id < cursor)
+        query = query.order_by(Service.id.desc()).limit(limit + 1)
+        rows = (await db.execute(query)).all() if summary else (await db.scalars(query)).all()
+
+        next_cursor = str(rows[limit - 1].id) if len(rows) > limit else None
+        rows = rows[:limit]
+        return ([ServiceSummary.model_validate(row) for row in rows] if summary else rows), next_cursor
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Database error. Failed to fetch services.")
 
-async def delete_service(service_id: int, farmer_id: int, db: Session):
+async def delete_service(service_id: int, farmer_id: int, db: AsyncSession):
     try:
-        service = db.query(Service).filter(Service.id == service_id, Service.farmer_id == farmer_id).first()
+        service = await db.scalar(select(Service).where(Service.id == service_id, Service.farmer_id == farmer_id))
 
         if not service:
             raise HTTPException(status_code=404, detail="Service not found.")
 
-        db.delete(service)
-        db.commit()
+        await db.delete(service)
+        await db.commit()
+        await service_index.remove_all([service_id])
+        await bump_cell_version(service.h3_index)
         return {"message": "Service deleted successfully."}
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Database error. Failed to delete service.")
 
-async def nearby_services(farmer_id: int, latitude: float, longitude: float, k: int, db: Session) -> List[ServiceResponse]:
+async def nearby_services(farmer_id: int, latitude: float, longitude: float, k: int, db: AsyncSession,
+                          limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Tuple[ServiceRecord, float]], Optional[str]]:
+    """One page of (record, distance_km), nearest first; serialize it with nearby_service_json"""
     try:
-        h3_indices = get_k_ring(latitude, longitude, k)
-        services = (
-            db.query(Service)
-            .options(joinedload(Service.farmer).joinedload(Farmer.user))
-            .filter(Service.h3_index.in_(h3_indices), Service.farmer_id != farmer_id)
-            .all()
-        )
-
-        return [
-            ServiceResponse(
-                id=service.id,
-                service_name=service.service_name,
-                description=service.description,
-                latitude=service.latitude,
-                longitude=service.longitude,
-                cost=float(service.cost),
-                status=service.status,
-                location=service.location,
-                h3_index=service.h3_index,
-                farmer_name=service.farmer.user.name,
-                farmer_id=service.farmer_id
-            )
-            for service in services
-        ]
+        ring = get_ring(latitude, longitude, k)
+
+        # Answer from the in-memory index once it has been warmed
+        if service_index.ready:
+            records = [record for record in service_index.query(ring.cells) if record.farmer_id != farmer_id]
+        else:
+            async def load() -> List[ServiceRecord]:
+                # Cached under the cell versions read just before; only the primary is sure to reflect them
+                async with primary_session(db) as primary:
+                    rows = await primary.execute(
+                        SERVICE_RECORD_SELECT.where(cover_filter(Service, ring.cover), Service.status == SERVICE_STATUS["active"])
+                    )
+                return list(map(ServiceRecord._make, rows))
+
+            # Cached per ring, not per caller; the caller's own services are dropped afterwards
+            key = cache_key("services", ring.origin, ring.k, "status=active")
+            cached = await cached_records(key, ring.cells, load, service_record_from_row)
+            records = [record for record in cached if record.farmer_id != farmer_id]
+
+        # The k-ring over-covers the radius; keep true distances only, nearest first
+        return rank_by_distance(records, latitude, longitude, k, limit, cursor)
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Database error. Failed to fetch nearby services.")
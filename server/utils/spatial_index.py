@@ -0,0 +1,304 @@
+# AgriCare/server/utils/spatial_index.py
+
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import Float, Numeric, Select, cast, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import SessionLocal
+from models.job import Job, STATUS_MAP
+from models.service import Service, SERVICE_STATUS
+from models.farmer import Farmer
+from models.user import User
+from utils.job_feed import job_feed
+
+# Each index shares its changes with the other processes on INDEX_CHANNEL_PREFIX + name
+INDEX_CHANNEL_PREFIX = "index:"
+
+
+class JobRecord(NamedTuple):
+    id: int
+    title: str
+    description: str
+    number_of_labourers: int
+    required_skills: Optional[Tuple[str, ...]]
+    latitude: float
+    longitude: float
+    daily_wage: float
+    perks: Optional[Tuple[str, ...]]
+    start_date: object
+    end_date: object
+    status: int
+    location: str
+    h3_index: str
+    farmer_id: int
+    farmer_name: str
+
+
+class ServiceRecord(NamedTuple):
+    id: int
+    service_name: str
+    description: Optional[str]
+    latitude: float
+    longitude: float
+    cost: float
+    status: int
+    location: str
+    h3_index: str
+    farmer_id: int
+    farmer_name: str
+
+
+def _tuple_or_none(values) -> Optional[tuple]:
+    return tuple(values) if values is not None else None
+
+
+def record_select(model, record_type) -> Select:
+    """
+    Core SELECT of exactly the record's columns, in field order, so every row
+    maps straight onto the record with record_type._make. users is joined for
+    the farmer's name only; Numeric columns come back as floats.
+    """
+    columns = []
+    for name in record_type._fields:
+        if name == "farmer_name":
+            columns.append(User.name)
+            continue
+        column = getattr(model, name)
+        numeric = isinstance(column.type, Numeric) and not isinstance(column.type, Float)
+        columns.append(cast(column, Float).label(name) if numeric else column)
+    return (
+        select(*columns)
+        .join(Farmer, model.farmer_id == Farmer.id)
+        .join(User, Farmer.user_id == User.id)
+    )
+
+
+JOB_RECORD_SELECT = record_select(Job, JobRecord)
+SERVICE_RECORD_SELECT = record_select(Service, ServiceRecord)
+
+
+def job_record(job: Job, farmer_name: str) -> JobRecord:
+    return JobRecord(
+        id=job.id,
+        title=job.title,
+        description=job.description,
+        number_of_labourers=job.number_of_labourers,
+        required_skills=_tuple_or_none(job.required_skills),
+        latitude=job.latitude,
+        longitude=job.longitude,
+        daily_wage=float(job.daily_wage),
+        perks=_tuple_or_none(job.perks),
+        start_date=job.start_date,
+        end_date=job.end_date,
+        status=job.status,
+        location=job.location,
+        h3_index=job.h3_index,
+        farmer_id=job.farmer_id,
+        farmer_name=farmer_name,
+    )
+
+
+def job_record_from_row(row: dict) -> JobRecord:
+    """Inverse of JSON-encoding record._asdict(), dates included"""
+    row["start_date"] = datetime.fromisoformat(row["start_date"])
+    if row["end_date"] is not None:
+        row["end_date"] = datetime.fromisoformat(row["end_date"])
+    return JobRecord(**row)
+
+
+def service_record_from_row(row: dict) -> ServiceRecord:
+    return ServiceRecord(**row)
+
+
+def service_record(service: Service, farmer_name: str) -> ServiceRecord:
+    return ServiceRecord(
+        id=service.id,
+        service_name=service.service_name,
+        description=service.description,
+        latitude=service.latitude,
+        longitude=service.longitude,
+        cost=float(service.cost),
+        status=service.status,
+        location=service.location,
+        h3_index=service.h3_index,
+        farmer_id=service.farmer_id,
+        farmer_name=farmer_name,
+    )
+
+
+class SpatialIndex:
+    """
+    Process-local map of H3 cell -> {id: record}. Mutations that land while a
+    reconciliation snapshot is being loaded are journaled and replayed on swap.
+    upsert_all/remove_all also broadcast the change through the feed, and every
+    other process's index of the same name applies it on receipt.
+    """
+    def __init__(self, name: str, from_row: Callable[[dict], NamedTuple], feed=job_feed):
+        self.name = name
+        self.from_row = from_row
+        self.feed = feed
+        self.channel = INDEX_CHANNEL_PREFIX + name
+        self.origin = uuid.uuid4().hex
+        self.received = 0
+        self.cells: Dict[str, Dict[int, NamedTuple]] = {}
+        self.cell_of: Dict[int, str] = {}
+        self.ready = False
+        self.last_reconciled: Optional[float] = None
+        self._journal: Optional[list] = None
+        feed.on_broadcast(self.channel, self.receive)
+
+    def __len__(self) -> int:
+        return len(self.cell_of)
+
+    def upsert(self, record):
+        if self._journal is not None:
+            self._journal.append(("upsert", record))
+        self._upsert(record)
+
+    def remove(self, record_id: int):
+        if self._journal is not None:
+            self._journal.append(("remove", record_id))
+        self._remove(record_id)
+
+    async def upsert_all(self, records: Iterable):
+        """Index records here and in every other process"""
+        records = list(records)
+        for record in records:
+            self.upsert(record)
+        if records:
+            await self._share({"upsert": [record._asdict() for record in records]})
+
+    async def remove_all(self, record_ids: Iterable[int]):
+        """Drop records here and in every other process"""
+        record_ids = list(record_ids)
+        for record_id in record_ids:
+            self.remove(record_id)
+        if record_ids:
+            await self._share({"remove": record_ids})
+
+    async def _share(self, change: dict):
+        message = json.dumps({"origin": self.origin, **change}, default=lambda value: value.isoformat())
+        await self.feed.broadcast(self.channel, message)
+
+    def receive(self, message: str):
+        """Apply a change broadcast by another process; our own were applied when made"""
+        change = json.loads(message)
+        if change["origin"] == self.origin:
+            return
+        self.received += 1
+        for row in change.get("upsert", ()):
+            self.upsert(self.from_row(row))
+        for record_id in change.get("remove", ()):
+            self.remove(record_id)
+
+    def _upsert(self, record):
+        self._remove(record.id)
+        self.cells.setdefault(record.h3_index, {})[record.id] = record
+        self.cell_of[record.id] = record.h3_index
+
+    def _remove(self, record_id: int):
+        cell = self.cell_of.pop(record_id, None)
+        if cell is None:
+            return
+        bucket = self.cells.get(cell)
+        if bucket is not None:
+            bucket.pop(record_id, None)
+            if not bucket:
+                del self.cells[cell]
+
+    def begin_rebuild(self):
+        self._journal = []
+
+    def abort_rebuild(self):
+        self._journal = None
+
+    def replace_all(self, records: Iterable):
+        cells: Dict[str, Dict[int, NamedTuple]] = {}
+        cell_of: Dict[int, str] = {}
+        for record in records:
+            cells.setdefault(record.h3_index, {})[record.id] = record
+            cell_of[record.id] = record.h3_index
+
+        journal, self._journal = self._journal or [], None
+        self.cells, self.cell_of = cells, cell_of
+        for op, value in journal:
+            if op == "upsert":
+                self._upsert(value)
+            else:
+                self._remove(value)
+
+        self.ready = True
+        self.last_reconciled = time.time()
+
+    def query(self, h3_indices: Iterable[str]) -> List:
+        cells = self.cells
+        results = []
+        for cell in h3_indices:
+            bucket = cells.get(cell)
+            if bucket:
+                results.extend(bucket.values())
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "records": len(self.cell_of),
+            "cells": len(self.cells),
+            "last_reconciled": self.last_reconciled,
+            "received": self.received,
+        }
+
+
+job_index = SpatialIndex("jobs", job_record_from_row)
+service_index = SpatialIndex("services", service_record_from_row)
+
+
+def load_open_jobs(db: Session) -> List[JobRecord]:
+    rows = db.execute(JOB_RECORD_SELECT.where(Job.status == STATUS_MAP["open"]).execution_options(yield_per=5000))
+    return list(map(JobRecord._make, rows))
+
+
+def load_active_services(db: Session) -> List[ServiceRecord]:
+    rows = db.execute(SERVICE_RECORD_SELECT.where(Service.status == SERVICE_STATUS["active"]).execution_options(yield_per=5000))
+    return list(map(ServiceRecord._make, rows))
+
+
+async def farmer_name(db: AsyncSession, farmer_id: int) -> str:
+    return await db.scalar(select(User.name).join(Farmer, Farmer.user_id == User.id).where(Farmer.id == farmer_id))
+
+
+def _load_snapshot():
+    db = SessionLocal()
+    try:
+        return load_open_jobs(db), load_active_services(db)
+    finally:
+        db.close()
+
+
+async def reconcile_indexes():
+    """Reload both indexes from the database without blocking the event loop"""
+    job_index.begin_rebuild()
+    service_index.begin_rebuild()
+    try:
+        jobs, services = await asyncio.to_thread(_load_snapshot)
+    except Exception:
+        job_index.abort_rebuild()
+        service_index.abort_rebuild()
+        raise
+    job_index.replace_all(jobs)
+    service_index.replace_all(services)
+    print(f"✅ Spatial index loaded: {len(job_index)} jobs, {len(service_index)} services")
+
+
+async def reconcile_forever(interval_seconds: float):
+    while True:
+        try:
+            await reconcile_indexes()
+        except Exception as e:
+            print(f"⚠️ Spatial index reconciliation failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -5,12 +5,10 @@ import time
 from datetime import timedelta
 from config import Config
 from fastapi import HTTPException, Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from db import get_db
-from models.user import User
-from models.farmer import Farmer
-from models.labour import Labour
 from utils.helper import request_to_token
+from utils.identity import Identity, resolve_identity
 from models.user import REVERSE_ROLE_MAP, ROLE_MAP
 
 def create_token(data: dict) -> str:
@@ -30,36 +28,36 @@ def verify_token(token: str) -> dict:
         raise HTTPException(401, "Invalid token!")
     
 
-def require_role(required_role: int):
-    def role_checker(token: str = Depends(request_to_token)):
-        payload = verify_token(token)
-        if payload.get("role") != REVERSE_ROLE_MAP.get(required_role):
-            raise HTTPException(status_code=403, detail="Forbidden")
+def request_claims(request: Request) -> dict:
+    """Verify the bearer token once per request; later callers reuse the decoded claims"""
+    claims = getattr(request.state, "auth_claims", None)
+    if claims is None:
+        claims = verify_token(request_to_token(request))
+        request.state.auth_claims = claims
+    return claims
 
-    return Depends(role_checker)
 
+async def current_identity(request: Request, db: AsyncSession = Depends(get_db)) -> Identity:
+    identity = getattr(request.state, "identity", None)
+    if identity is None:
+        identity = await resolve_identity(db, request_claims(request))
+        request.state.identity = identity
+    return identity
+
+
+def _role_id_dependency(required_role: int):
+    async def role_id(request: Request, identity: Identity = Depends(current_identity)) -> int:
+        if identity.role != REVERSE_ROLE_MAP.get(required_role):
+            raise HTTPException(status_code=403, detail="Forbidden")
+        return identity.role_id
+
+    return role_id
 
-def token_to_farmer_id(db: Session, token: str) -> int:
-    payload = verify_token(token)
-    email = payload.get("email")
-    user = db.query(User).filter_by(email=email).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    farmer = db.query(Farmer).filter_by(user_id=user.id).first()
-    if not farmer:
-        raise HTTPException(status_code=404, detail="Farmer not found")
 
-    return farmer.id
+# Route dependencies: verify the token, check the role and return the caller's id
+current_farmer_id = _role_id_dependency(ROLE_MAP["farmer"])
+current_labour_id = _role_id_dependency(ROLE_MAP["labour"])
 
-def token_to_user_id(db: Session, token: str) -> int:
-    payload = verify_token(token)
-    email = payload.get("email")
-    phone = payload.get("phone")
-    user_by_email = db.query(User).filter_by(email=email).first() if email else None
-    user_by_phone = db.query(User).filter_by(phone=phone).first() if phone else None
 
-    user = user_by_email or user_by_phone
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user.id
\ No newline at end of file
+async def current_user_id(identity: Identity = Depends(current_identity)) -> int:
+    return identity.user_id
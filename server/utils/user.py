@@ -1,6 +1,8 @@
 # AgriCare/server/utils/user.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import User, ROLE_MAP
 from models.farmer import Farmer
 from models.labour import Labour
@@ -8,13 +10,16 @@ from schemas.user import UserBase
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
 
-def get_user_by_email(email: str, db: Session):
-    return db.query(User).filter_by(email=email).first()
+# Login reads user.farmer / user.labour, which cannot lazy-load on an AsyncSession
+_WITH_ROLE = (selectinload(User.farmer), selectinload(User.labour))
 
-def get_user_by_phone(phone: str, db: Session):
-    return db.query(User).filter_by(phone=phone).first()
+async def get_user_by_email(email: str, db: AsyncSession):
+    return await db.scalar(select(User).options(*_WITH_ROLE).where(User.email == email))
 
-def create_user(user_data: UserBase, db: Session):
+async def get_user_by_phone(phone: str, db: AsyncSession):
+    return await db.scalar(select(User).options(*_WITH_ROLE).where(User.phone == phone))
+
+async def create_user(user_data: UserBase, db: AsyncSession):
     try:
         new_user = User(
         name=user_data.name,
@@ -23,8 +28,7 @@ def create_user(user_data: UserBase, db: Session):
         role=ROLE_MAP[user_data.role])
 
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.flush()
 
         if user_data.role == "farmer":
             new_farmer = Farmer(user_id=new_user.id)
@@ -33,9 +37,9 @@ def create_user(user_data: UserBase, db: Session):
             new_labour = Labour(user_id=new_user.id)
             db.add(new_labour)
 
-        db.commit()
+        await db.commit()
         return new_user
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         print(e)
         raise HTTPException(status_code=500, detail="Database error. Please try again later.")